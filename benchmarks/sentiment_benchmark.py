@@ -0,0 +1,75 @@
+"""
+Compare the TextBlob and lexicon sentiment engines on a fixture news corpus
+
+Run from the repository root:
+
+    python benchmarks/sentiment_benchmark.py --repeat 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.lexicon_sentiment import get_lexicon_engine
+from utils.sentiment_workers import score_texts
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "news_corpus.json")
+
+def label(polarity: float) -> str:
+    """Same thresholds as NewsAnalyzer._label_sentiment"""
+    if polarity > 0.1:
+        return 'Positive'
+    if polarity < -0.1:
+        return 'Negative'
+    return 'Neutral'
+
+def load_texts(path: str):
+    """Join headline and summary the way NewsAnalyzer scores an article"""
+    with open(path, encoding="utf-8") as f:
+        articles = json.load(f)
+    return [f"{article['headline']} {article['summary']}" for article in articles]
+
+def timed(score, texts):
+    start = time.perf_counter()
+    result = score(texts)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="times the corpus is repeated for the throughput run")
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    args = parser.parse_args()
+
+    texts = load_texts(args.corpus)
+    batch = texts * args.repeat
+
+    # Load the lexicon outside the timed region, TextBlob loads its own on import
+    engine = get_lexicon_engine()
+    score_texts(texts[:1])
+
+    textblob_scores, textblob_seconds = timed(score_texts, batch)
+    (lexicon_polarity, _), lexicon_seconds = timed(engine.score, batch)
+
+    textblob_labels = [label(polarity) for polarity, _ in textblob_scores[:len(texts)]]
+    lexicon_labels = [label(polarity) for polarity in lexicon_polarity[:len(texts)]]
+    agreement = sum(a == b for a, b in zip(textblob_labels, lexicon_labels)) / len(texts)
+    max_delta = max(abs(a - b) for (a, _), b in zip(textblob_scores, lexicon_polarity))
+
+    print(f"Corpus: {len(texts)} articles x {args.repeat} = {len(batch)} texts")
+    print(f"{'engine':<10}{'seconds':>10}{'texts/sec':>14}")
+    print(f"{'textblob':<10}{textblob_seconds:>10.3f}{len(batch) / textblob_seconds:>14.0f}")
+    print(f"{'lexicon':<10}{lexicon_seconds:>10.3f}{len(batch) / lexicon_seconds:>14.0f}")
+    print(f"Speed-up: {textblob_seconds / lexicon_seconds:.1f}x")
+    print(f"Label agreement: {agreement:.1%}")
+    print(f"Max polarity difference: {max_delta:.3f}")
+
+    for text, expected, actual in zip(texts, textblob_labels, lexicon_labels):
+        if expected != actual:
+            print(f"  textblob={expected:<8} lexicon={actual:<8} {text[:70]}")
+
+if __name__ == "__main__":
+    main()
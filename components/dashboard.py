@@ -3,8 +3,7 @@ import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 from datetime import datetime, timedelta
-import time
-from utils.data_fetcher import DataFetcher
+from utils.data_fetcher import get_data_fetcher
 from utils.speech_handler import SpeechHandler
 from components.loading_widget import LoadingWidget
 from utils.market_facts import MarketFacts
@@ -13,7 +12,7 @@ def render_dashboard():
     """Render the main dashboard"""
     
     # Initialize components
-    data_fetcher = DataFetcher()
+    data_fetcher = get_data_fetcher()
     speech_handler = SpeechHandler()
     loading_widget = LoadingWidget()
     market_facts = MarketFacts()
@@ -40,8 +39,9 @@ def render_dashboard():
     
     # Main dashboard content
     with st.container():
-        # Custom loading with market facts
-        loading_widget.show_loading_with_facts("market_data", duration=2)
+        # Custom loading with market facts while the overview is fetched
+        with loading_widget.loading_with_facts("market_data"):
+            data_fetcher.get_market_overview()
         
         # Market overview section
         st.subheader("📈 Market Overview")
@@ -490,14 +490,15 @@ def render_stock_comparison(data_fetcher):
         compare_button = st.button("🔄 Compare", key="compare_stocks")
     
     if compare_button and stock1 and stock2 and stock1 != stock2:
-        # Show loading with facts for comparison
         loading_widget = LoadingWidget()
-        loading_widget.show_loading_with_facts("comparison", duration=2)
         
         try:
-            # Fetch data for both stocks
-            stock1_data = data_fetcher.get_stock_data(stock1, "5d")
-            stock2_data = data_fetcher.get_stock_data(stock2, "5d")
+            # Fetch data for both stocks, showing market facts meanwhile
+            with loading_widget.loading_with_facts("comparison") as progress:
+                stock1_data = data_fetcher.get_stock_data(stock1, "5d")
+                progress(1, 2)
+                stock2_data = data_fetcher.get_stock_data(stock2, "5d")
+                progress(2, 2)
             
             if (stock1_data and 'history' in stock1_data and not stock1_data['history'].empty and
                 stock2_data and 'history' in stock2_data and not stock2_data['history'].empty):
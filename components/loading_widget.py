@@ -3,16 +3,21 @@ Custom loading widget with market facts
 """
 
 import streamlit as st
-import time
 import random
+from contextlib import contextmanager
 from utils.market_facts import MarketFacts
 
 class LoadingWidget:
     def __init__(self):
         self.market_facts = MarketFacts()
     
-    def show_loading_with_facts(self, context="general", duration=2):
-        """Show loading spinner with market facts"""
+    @contextmanager
+    def loading_with_facts(self, context="general"):
+        """Show a loading card with market facts while the wrapped block runs
+
+        Yields a progress callback, progress(done, total), that the wrapped
+        fetches can report to; the card is removed as soon as the block ends.
+        """
         loading_message = self.market_facts.get_loading_message(context)
         
         # Create a placeholder for the loading content
@@ -55,12 +60,18 @@ class LoadingWidget:
             }}
             </style>
             """, unsafe_allow_html=True)
+            
+            progress_bar = st.empty()
         
-        # Wait for the specified duration
-        time.sleep(duration)
+        def report_progress(done, total):
+            if total:
+                progress_bar.progress(min(done / total, 1.0), text=f"Loaded {done} of {total}")
         
-        # Clear the loading widget
-        loading_container.empty()
+        try:
+            yield report_progress
+        finally:
+            # Clear the loading widget
+            loading_container.empty()
     
     def show_sentiment_based_alert(self, sentiment, message, value=None):
         """Show alert with sentiment-based styling"""
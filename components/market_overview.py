@@ -4,7 +4,9 @@ import plotly.express as px
 import pandas as pd
 from datetime import datetime, timedelta
 import numpy as np
-from utils.data_fetcher import DataFetcher
+from utils.data_fetcher import get_data_fetcher
+from utils.chart_utils import line_trace
+from utils.market_breadth import CAP_BUCKETS
 from utils.technical_analysis import TechnicalAnalyzer
 from utils.speech_handler import SpeechHandler
 
@@ -12,7 +14,7 @@ def render_market_overview():
     """Render comprehensive market overview page"""
     
     # Initialize components
-    data_fetcher = DataFetcher()
+    data_fetcher = get_data_fetcher()
     tech_analyzer = TechnicalAnalyzer()
     speech_handler = SpeechHandler()
     
@@ -39,6 +41,11 @@ def render_market_overview():
         
         st.markdown("---")
         
+        # Top movers and volume screens
+        render_stock_screener(data_fetcher)
+        
+        st.markdown("---")
+        
         # Market trends and patterns
         render_market_trends(data_fetcher, tech_analyzer)
         
@@ -212,42 +219,40 @@ def render_indices_dashboard(data_fetcher):
                     st.caption(f"Volume: {volume:,.0f}")
         
         # Historical performance chart
-        render_indices_chart(data_fetcher, market_data)
+        render_indices_chart(data_fetcher)
     else:
         st.warning("⚠️ Unable to load indices data. Market may be closed or experiencing connectivity issues.")
         render_indices_fallback()
 
-def render_indices_chart(data_fetcher, market_data):
+def render_indices_chart(data_fetcher):
     """Render historical indices performance chart"""
     st.markdown("### 📈 Indices Trend (Last 30 Days)")
     
-    # Create mock historical data for demonstration
-    # In production, this would fetch actual historical data
-    dates = pd.date_range(end=datetime.now(), periods=30, freq='D')
+    history = data_fetcher.get_indices_history(30)
+    if not history or history['rebased'].empty:
+        st.info("📊 Historical index data is not available right now.")
+        return
     
     fig = go.Figure()
     
     colors = ['#FF6B35', '#F7931E', '#FFD23F', '#06FFA5']
     
-    for i, (index_name, data) in enumerate(market_data.items()):
-        # Generate trend data (in production, fetch real historical data)
-        base_value = data.get('current', 50000)
-        trend_data = np.random.normal(0, 0.01, 30).cumsum()
-        values = base_value * (1 + trend_data)
-        
-        fig.add_trace(go.Scatter(
-            x=dates,
-            y=values,
+    # Indices are rebased to 100 so they share one axis; hover shows the actual level
+    for i, index_name in enumerate(history['rebased'].columns):
+        fig.add_trace(line_trace(
+            x=history['rebased'].index,
+            y=history['rebased'][index_name],
+            customdata=history['levels'][index_name],
             mode='lines',
             name=index_name,
             line=dict(color=colors[i % len(colors)], width=3),
-            hovertemplate=f'{index_name}: %{{y:,.2f}}<extra></extra>'
+            hovertemplate=f'{index_name}: %{{customdata:,.2f}} (%{{y:.1f}})<extra></extra>'
         ))
     
     fig.update_layout(
         title="30-Day Index Performance",
         xaxis_title="Date",
-        yaxis_title="Index Value",
+        yaxis_title="Performance (Start = 100)",
         height=400,
         hovermode='x unified',
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
@@ -259,13 +264,18 @@ def render_market_breadth(data_fetcher):
     """Render market breadth indicators"""
     st.subheader("🎯 Market Breadth & Health")
     
+    breadth = data_fetcher.get_market_breadth()
+    if not breadth:
+        st.info("📊 Market breadth data is not available right now.")
+        return
+    
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         # Advance-Decline ratio
-        advances = 1250  # This would be fetched from real data
-        declines = 850
-        unchanged = 100
+        advances = breadth['advances']
+        declines = breadth['declines']
+        unchanged = breadth['unchanged']
         
         ad_ratio = advances / declines if declines > 0 else 0
         
@@ -273,56 +283,52 @@ def render_market_breadth(data_fetcher):
             "Advance/Decline",
             f"{ad_ratio:.2f}",
             f"↗️ {advances} | ↘️ {declines}",
-            help="Ratio of advancing to declining stocks"
+            help=f"Ratio of advancing to declining stocks across {breadth['symbols']} tracked stocks"
         )
     
     with col2:
         # New highs vs new lows
-        new_highs = 85
-        new_lows = 25
+        new_highs = breadth['new_highs']
+        new_lows = breadth['new_lows']
         
         st.metric(
             "New Highs/Lows",
             f"{new_highs}/{new_lows}",
-            f"+{new_highs - new_lows}",
+            f"{new_highs - new_lows:+d}",
             help="Stocks hitting 52-week highs vs lows"
         )
     
     with col3:
         # Market cap participation
-        large_cap_change = 1.2
-        mid_cap_change = 0.8
-        small_cap_change = -0.3
-        
-        st.markdown("""
-        **Market Cap Performance**
-        - Large Cap: +1.2%
-        - Mid Cap: +0.8%
-        - Small Cap: -0.3%
-        """)
+        cap_lines = "\n".join(f"- {bucket}: {change:+.1f}%" for bucket, change in breadth['cap_returns'].items())
+        st.markdown(f"**Market Cap Performance**\n{cap_lines}")
     
     with col4:
-        # Sector rotation
-        leading_sector = "Banking"
-        lagging_sector = "Auto"
+        # Sector rotation, from the same aggregation as the sector heatmap
+        sector_data = data_fetcher.get_sector_performance()
         
-        st.markdown(f"""
-        **Sector Rotation**
-        - Leading: {leading_sector}
-        - Lagging: {lagging_sector}
-        """)
+        if sector_data:
+            ranked = sorted(sector_data, key=lambda sector: sector_data[sector]['avg_change'])
+            leading_sector = ranked[-1]
+            lagging_sector = ranked[0]
+            
+            st.markdown(f"""
+            **Sector Rotation**
+            - Leading: {leading_sector}
+            - Lagging: {lagging_sector}
+            """)
     
     # Market breadth chart
-    render_breadth_chart()
+    render_breadth_chart(breadth)
 
-def render_breadth_chart():
+def render_breadth_chart(breadth):
     """Render market breadth visualization"""
     col1, col2 = st.columns(2)
     
     with col1:
         # Advance-Decline chart
         categories = ['Advances', 'Declines', 'Unchanged']
-        values = [1250, 850, 100]
+        values = [breadth['advances'], breadth['declines'], breadth['unchanged']]
         colors = ['green', 'red', 'gray']
         
         fig_pie = px.pie(
@@ -337,9 +343,8 @@ def render_breadth_chart():
     
     with col2:
         # Market cap performance
-        market_caps = ['Large Cap', 'Mid Cap', 'Small Cap']
-        performance = [1.2, 0.8, -0.3]
-        colors_bar = ['green' if x > 0 else 'red' for x in performance]
+        market_caps = list(breadth['cap_returns'].keys())
+        performance = list(breadth['cap_returns'].values())
         
         fig_bar = px.bar(
             x=market_caps,
@@ -361,17 +366,25 @@ def render_sector_heatmap(data_fetcher):
         sector_data = data_fetcher.get_sector_performance()
     
     if sector_data:
+        weighting = st.radio(
+            "Weighting:",
+            ["Equal-weighted", "Value-weighted"],
+            horizontal=True,
+            help="Value-weighted returns weight each stock by its median traded value"
+        )
+        weighted = weighting == "Value-weighted"
+        
         # Create sector heatmap
         sectors = list(sector_data.keys())
-        changes = [data['avg_change'] for data in sector_data.values()]
+        changes = [data['weighted_change' if weighted else 'avg_change'] for data in sector_data.values()]
         
-        # Create a more detailed heatmap with sub-sectors
-        sector_matrix = create_sector_matrix(sectors, changes)
+        # Break every sector down by market-cap bucket
+        sector_matrix = create_sector_matrix(sector_data, weighted)
         
         fig = px.imshow(
             sector_matrix,
             labels=dict(x="Sub-Sectors", y="Main Sectors", color="Change %"),
-            x=['Large Cap', 'Mid Cap', 'Small Cap'],
+            x=CAP_BUCKETS,
             y=sectors,
             color_continuous_scale='RdYlGn',
             aspect="auto"
@@ -389,17 +402,12 @@ def render_sector_heatmap(data_fetcher):
     else:
         st.info("📊 Sector performance data will be available during market hours")
 
-def create_sector_matrix(sectors, changes):
-    """Create sector performance matrix for heatmap"""
-    matrix = []
-    for change in changes:
-        # Create variations for different market caps
-        large_cap = change
-        mid_cap = change * 1.1  # Slightly different performance
-        small_cap = change * 0.9
-        matrix.append([large_cap, mid_cap, small_cap])
-    
-    return np.array(matrix)
+def create_sector_matrix(sector_data, weighted=False):
+    """Create sector performance matrix for heatmap (NaN where a sector has no stocks in a bucket)"""
+    key = 'cap_changes_weighted' if weighted else 'cap_changes'
+    matrix = [[data[key].get(bucket, np.nan) for bucket in CAP_BUCKETS] for data in sector_data.values()]
+    
+    return np.array(matrix, dtype=float)
 
 def render_sector_leaders_laggards(sectors, changes):
     """Render sector leaders and laggards"""
@@ -431,6 +439,39 @@ def render_sector_leaders_laggards(sectors, changes):
             </div>
             """, unsafe_allow_html=True)
 
+def render_stock_screener(data_fetcher):
+    """Render top movers and volume screens from one universe snapshot"""
+    st.subheader("🔎 Market Movers")
+    
+    screener = data_fetcher.get_screener()
+    if screener is None:
+        st.info("📊 Market movers will be available once market data loads")
+        return
+    
+    gainers, losers = screener.top_gainers_losers(5)
+    screens = [
+        ("🟢 Top Gainers", gainers, lambda stock: f"{stock['change_percent']:+.2f}%"),
+        ("🔴 Top Losers", losers, lambda stock: f"{stock['change_percent']:+.2f}%"),
+        ("🔥 Most Active", screener.screen('traded_value', 5),
+         lambda stock: f"₹{stock['traded_value'] / 1e7:,.1f} Cr traded"),
+        ("📢 Unusual Volume", screener.screen('volume_spike', 5, {'volume_spike': (1.5, None)}),
+         lambda stock: f"{stock['volume_spike']:.1f}x avg volume")
+    ]
+    
+    for column, (title, stocks, describe) in zip(st.columns(len(screens)), screens):
+        with column:
+            st.markdown(f"### {title}")
+            if not stocks:
+                st.caption("No stocks match right now")
+            for stock in stocks:
+                st.markdown(f"""
+                <div style='padding: 8px; margin: 4px 0; border-radius: 5px; 
+                            border-left: 4px solid {"green" if stock['change_percent'] >= 0 else "red"};'>
+                    <strong>{stock['symbol'].replace('.NS', '')}</strong> ₹{stock['price']:.2f}<br>
+                    <span style='font-size: 0.85em;'>{describe(stock)}</span>
+                </div>
+                """, unsafe_allow_html=True)
+
 def render_market_trends(data_fetcher, tech_analyzer):
     """Render market trends and technical patterns"""
     st.subheader("📈 Market Trends & Patterns")
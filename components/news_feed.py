@@ -3,15 +3,17 @@ import pandas as pd
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_fetcher import DataFetcher
+from utils.data_fetcher import get_data_fetcher
 from utils.news_analyzer import NewsAnalyzer
+from utils.news_dedup import collapse_near_duplicates
 from utils.speech_handler import SpeechHandler
+from components.loading_widget import LoadingWidget
 
 def render_news_feed():
     """Render the news feed page with comprehensive analysis"""
     
     # Initialize components
-    data_fetcher = DataFetcher()
+    data_fetcher = get_data_fetcher()
     news_analyzer = NewsAnalyzer()
     speech_handler = SpeechHandler()
     
@@ -27,8 +29,8 @@ def render_news_feed():
     render_news_controls()
     
     # Load and analyze news
-    with st.spinner('📡 Fetching latest market news and analyzing sentiment...'):
-        news_data = fetch_and_analyze_news(data_fetcher, news_analyzer)
+    with LoadingWidget().loading_with_facts("news") as progress:
+        news_data = fetch_and_analyze_news(data_fetcher, news_analyzer, on_progress=progress)
     
     if news_data:
         # News analysis dashboard
@@ -76,7 +78,7 @@ def render_news_controls():
             st.cache_data.clear()
             st.rerun()
 
-def fetch_and_analyze_news(data_fetcher, news_analyzer):
+def fetch_and_analyze_news(data_fetcher, news_analyzer, on_progress=None):
     """Fetch and analyze news data"""
     try:
         # Determine days based on time range
@@ -93,18 +95,11 @@ def fetch_and_analyze_news(data_fetcher, news_analyzer):
         general_news = data_fetcher.get_general_market_news()
         
         # Fetch company-specific news for major Indian stocks
-        company_news = []
         major_stocks = ['RELIANCE.NS', 'TCS.NS', 'INFY.NS', 'HDFCBANK.NS']
+        company_news = data_fetcher.get_news_for_symbols(major_stocks, days, on_progress=on_progress)
         
-        for stock in major_stocks:
-            try:
-                stock_news = data_fetcher.get_company_news(stock, days)
-                company_news.extend(stock_news)
-            except:
-                continue  # Skip if company news fails
-        
-        # Combine all news
-        all_news = general_news + company_news
+        # Combine all news, keeping one copy of stories syndicated across feeds
+        all_news = collapse_near_duplicates(general_news + company_news)
         
         if all_news:
             # Analyze news batch
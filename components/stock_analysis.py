@@ -2,15 +2,21 @@ import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
 from datetime import datetime, timedelta
-from utils.data_fetcher import DataFetcher
+from utils.data_fetcher import get_data_fetcher
 from utils.technical_analysis import TechnicalAnalyzer
+from utils.chart_utils import (CHART_WIDTHS, cached_figure, candle_colors, decimate_line, line_trace, minmax_indices,
+                               point_budget_for_width)
+from utils.ohlcv_store import clamp_period, supported_periods
 from utils.speech_handler import SpeechHandler
 
+# Periods offered for daily bars; shorter ones leave too few bars for the indicators
+DAILY_PERIODS = ["1mo", "3mo", "6mo", "1y", "2y", "5y"]
+
 def render_stock_analysis():
     """Render the stock analysis page"""
     
     # Initialize components
-    data_fetcher = DataFetcher()
+    data_fetcher = get_data_fetcher()
     tech_analyzer = TechnicalAnalyzer()
     speech_handler = SpeechHandler()
     
@@ -28,20 +34,29 @@ def render_stock_analysis():
     # Main analysis content
     if 'selected_stock' in st.session_state and st.session_state.selected_stock:
         stock_symbol = st.session_state.selected_stock
+        interval = st.session_state.get('analysis_interval', "1d")
+        period = clamp_period(st.session_state.get('analysis_period', "1y"), interval)
         
         with st.spinner(f'🔍 Analyzing {stock_symbol}...'):
             # Fetch stock data
-            stock_data = data_fetcher.get_stock_data(stock_symbol, "1y")
+            stock_data = data_fetcher.get_stock_data(stock_symbol, period, include_info=True, interval=interval)
             
             if stock_data:
+                # Compute indicators once and share them with every section below
+                indicators = tech_analyzer.get_indicator_bundle(stock_data['history'], stock_symbol, period, interval=interval)
+                
                 render_stock_overview(stock_data, data_fetcher)
-                render_technical_analysis(stock_data, tech_analyzer, stock_symbol)
-                render_price_charts(stock_data, tech_analyzer, stock_symbol)
-                render_trading_signals(stock_data, tech_analyzer)
+                
+                if st.checkbox("⚡ Show live intraday indicators", key="show_live_indicators"):
+                    render_live_indicators(data_fetcher, stock_symbol)
+                
+                render_technical_analysis(stock_data, tech_analyzer, stock_symbol, indicators)
+                render_price_charts(stock_data, tech_analyzer, stock_symbol, indicators, period, interval)
+                render_trading_signals(stock_data, tech_analyzer, indicators)
                 
                 # Voice features
                 if st.session_state.get('voice_enabled', False):
-                    render_voice_analysis_features(stock_symbol, tech_analyzer, stock_data, speech_handler)
+                    render_voice_analysis_features(stock_symbol, tech_analyzer, stock_data, speech_handler, indicators)
             else:
                 render_stock_error_page()
     else:
@@ -54,9 +69,7 @@ def render_stock_selector(data_fetcher):
     with col1:
         # Load sector-wise organization for better UX
         try:
-            import json
-            with open("assets/indian_stocks.json", "r", encoding="utf-8") as f:
-                stock_data = json.load(f)
+            stock_data = data_fetcher.stock_assets
             
             # Create sector-wise stock organization
             sector_options = ["All Stocks"] + list(stock_data.get("sector_wise_stocks", {}).keys())
@@ -91,8 +104,28 @@ def render_stock_selector(data_fetcher):
         st.session_state.selected_stock = selected_stock
     
     with col2:
+        # Bar interval selection
+        intervals = {
+            "1d": "Daily",
+            "1h": "Hourly",
+            "15m": "15 Minutes",
+            "5m": "5 Minutes",
+            "1m": "1 Minute"
+        }
+        
+        selected_interval = st.selectbox(
+            "⏱️ Bar Interval:",
+            options=list(intervals.keys()),
+            format_func=lambda x: intervals[x],
+            help="Intraday intervals cover shorter periods and refresh every minute"
+        )
+        
+        st.session_state.analysis_interval = selected_interval
+        
         # Time period selection
         time_periods = {
+            "1d": "1 Day",
+            "5d": "5 Days",
             "1mo": "1 Month",
             "3mo": "3 Months", 
             "6mo": "6 Months",
@@ -101,11 +134,15 @@ def render_stock_selector(data_fetcher):
             "5y": "5 Years"
         }
         
+        # Daily bars start at one month, intraday bars stop where Yahoo Finance's history ends
+        period_options = [p for p in supported_periods(selected_interval) if selected_interval != "1d" or p in DAILY_PERIODS]
+        default_period = "1y" if selected_interval == "1d" else period_options[-1]
+        
         selected_period = st.selectbox(
             "📅 Analysis Period:",
-            options=list(time_periods.keys()),
+            options=period_options,
             format_func=lambda x: time_periods[x],
-            index=3,  # Default to 1 year
+            index=period_options.index(default_period),
             help="Select time period for historical analysis"
         )
         
@@ -125,11 +162,24 @@ def render_stock_overview(stock_data, data_fetcher):
     # Get basic info
     info = stock_data.get('info', {})
     history = stock_data['history']
-    latest = history.iloc[-1]
-    prev = history.iloc[-2] if len(history) > 1 else latest
     
-    # Calculate metrics
-    current_price = latest['Close']
+    # Day and 52-week figures come from daily bars whatever period and interval are selected
+    try:
+        daily = data_fetcher.get_price_history(stock_data['symbol'], "1y")
+    except Exception:
+        # The overview still renders from the selected bars when daily history is unavailable
+        daily = None
+    if daily is None or daily.empty:
+        daily = history
+    latest = daily.iloc[-1]
+    prev = daily.iloc[-2] if len(daily) > 1 else latest
+    
+    # Right after the open the daily cache can still end at the previous session
+    if history.index[-1].date() > daily.index[-1].date():
+        prev = latest
+    
+    # Calculate metrics; the selected bars may be fresher than the daily cache
+    current_price = history['Close'].iloc[-1]
     change = current_price - prev['Close']
     change_percent = (change / prev['Close']) * 100 if prev['Close'] != 0 else 0
     
@@ -163,8 +213,8 @@ def render_stock_overview(stock_data, data_fetcher):
     
     with col5:
         # Calculate 52-week high/low
-        week_52_high = history['High'].max()
-        week_52_low = history['Low'].min()
+        week_52_high = daily['High'].max()
+        week_52_low = daily['Low'].min()
         st.metric(
             "52W High/Low",
             f"₹{week_52_high:.2f}",
@@ -198,12 +248,39 @@ def render_stock_overview(stock_data, data_fetcher):
             for item in key_info:
                 st.markdown(item)
 
-def render_technical_analysis(stock_data, tech_analyzer, stock_symbol):
+def render_live_indicators(data_fetcher, stock_symbol):
+    """Render intraday indicators maintained incrementally from 1-minute bars"""
+    live = data_fetcher.get_live_indicators(stock_symbol)
+    
+    if not live or live['timestamp'] is None:
+        st.info("Live intraday data is available during market hours (9:15 AM - 3:30 PM IST)")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Last Price (1m)", f"₹{live['close']:.2f}")
+    
+    with col2:
+        rsi = live['rsi']
+        st.metric("RSI (Wilder, 1m)", f"{rsi:.1f}" if rsi == rsi else "Warming up")
+    
+    with col3:
+        macd = live['macd_histogram']
+        st.metric("MACD Histogram", f"{macd:+.3f}" if macd == macd else "Warming up")
+    
+    with col4:
+        sma = live['sma_20']
+        st.metric("SMA 20 (1m)", f"₹{sma:.2f}" if sma == sma else "Warming up")
+    
+    st.caption(f"As of the last completed 1-minute bar at {live['timestamp'].strftime('%H:%M')} IST")
+
+def render_technical_analysis(stock_data, tech_analyzer, stock_symbol, indicators=None):
     """Render technical analysis section"""
     st.subheader("🔬 Technical Analysis")
     
     # Get technical summary
-    tech_summary = tech_analyzer.get_technical_summary(stock_data['history'])
+    tech_summary = tech_analyzer.get_technical_summary(stock_data['history'], indicators)
     
     # Overall signal display
     col1, col2, col3 = st.columns(3)
@@ -302,7 +379,7 @@ def render_technical_analysis(stock_data, tech_analyzer, stock_symbol):
                 for level in tech_summary['resistance_levels'][-3:]:  # Show last 3
                     st.markdown(f"• ₹{level:.2f}")
 
-def render_price_charts(stock_data, tech_analyzer, stock_symbol):
+def render_price_charts(stock_data, tech_analyzer, stock_symbol, indicators=None, period="1y", interval="1d"):
     """Render interactive price charts"""
     st.subheader("📈 Interactive Charts")
     
@@ -313,37 +390,67 @@ def render_price_charts(stock_data, tech_analyzer, stock_symbol):
         horizontal=True
     )
     
+    # Only send as many points as the chart can actually draw
+    resolution_options = list(CHART_WIDTHS.keys())
+    resolution = st.selectbox(
+        "Chart resolution:",
+        resolution_options,
+        index=resolution_options.index(st.session_state.get('chart_resolution', "Standard (1280px)")),
+        help="Long periods are downsampled to roughly one point per pixel of chart width"
+    )
+    st.session_state.chart_resolution = resolution
+    max_points = point_budget_for_width(CHART_WIDTHS[resolution])
+    
+    # Unchanged charts are served from the figure cache instead of being rebuilt
+    history = stock_data['history']
+    template = 'plotly_dark' if st.session_state.get('dark_mode', False) else 'plotly_white'
+    chart_key = (stock_symbol, period, interval, chart_type, max_points, len(history),
+                 history.index[-1] if not history.empty else None,
+                 float(history['Close'].iloc[-1]) if not history.empty else None, template)
+    
+    fig = cached_figure(chart_key, lambda: build_price_chart(
+        stock_data, tech_analyzer, stock_symbol, chart_type, indicators, max_points, template
+    ))
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_price_chart(stock_data, tech_analyzer, stock_symbol, chart_type, indicators=None, max_points=None,
+                      template='plotly_white'):
+    """Build the figure for one of the interactive chart types"""
+    if indicators is None:
+        indicators = tech_analyzer.compute_indicators(stock_data['history'])
+    
+    close = decimate_line(stock_data['history']['Close'], max_points)
+    
     if chart_type == "Candlestick with Indicators":
         # Technical analysis chart
-        fig = tech_analyzer.create_technical_chart(stock_data['history'], stock_symbol)
-        st.plotly_chart(fig, use_container_width=True)
+        fig = tech_analyzer.create_technical_chart(stock_data['history'], stock_symbol, indicators, max_points, template)
         
     elif chart_type == "Line Chart":
         # Simple line chart
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
-            x=stock_data['history'].index,
-            y=stock_data['history']['Close'],
+        fig.add_trace(line_trace(
+            x=close.index,
+            y=close,
             mode='lines',
             name='Close Price',
             line=dict(color='#FF6B35', width=2)
         ))
         
         # Add moving averages
-        sma_20 = tech_analyzer.calculate_sma(stock_data['history']['Close'], 20)
-        sma_50 = tech_analyzer.calculate_sma(stock_data['history']['Close'], 50)
+        sma_20 = decimate_line(indicators['SMA_20'], max_points)
+        sma_50 = decimate_line(indicators['SMA_50'], max_points)
         
-        fig.add_trace(go.Scatter(
-            x=stock_data['history'].index,
+        fig.add_trace(line_trace(
+            x=sma_20.index,
             y=sma_20,
             mode='lines',
             name='SMA 20',
             line=dict(color='orange', width=1)
         ))
         
-        fig.add_trace(go.Scatter(
-            x=stock_data['history'].index,
+        fig.add_trace(line_trace(
+            x=sma_50.index,
             y=sma_50,
             mode='lines',
             name='SMA 50',
@@ -354,32 +461,33 @@ def render_price_charts(stock_data, tech_analyzer, stock_symbol):
             title=f'{stock_symbol} - Price Movement',
             xaxis_title='Date',
             yaxis_title='Price (₹)',
-            height=500
+            height=500,
+            template=template
         )
         
-        st.plotly_chart(fig, use_container_width=True)
-        
     elif chart_type == "Volume Analysis":
         # Volume analysis chart
         fig = go.Figure()
         
         # Price line
-        fig.add_trace(go.Scatter(
-            x=stock_data['history'].index,
-            y=stock_data['history']['Close'],
+        fig.add_trace(line_trace(
+            x=close.index,
+            y=close,
             mode='lines',
             name='Price',
             yaxis='y',
             line=dict(color='#FF6B35')
         ))
         
-        # Volume bars
-        volume_colors = ['green' if stock_data['history']['Close'].iloc[i] >= stock_data['history']['Open'].iloc[i] 
-                        else 'red' for i in range(len(stock_data['history']))]
+        # Volume bars, keeping each bucket's quietest and busiest session
+        volume_data = stock_data['history'].iloc[
+            minmax_indices(stock_data['history']['Volume'].to_numpy(dtype=float), max_points)
+        ]
+        volume_colors = candle_colors(volume_data)
         
         fig.add_trace(go.Bar(
-            x=stock_data['history'].index,
-            y=stock_data['history']['Volume'],
+            x=volume_data.index,
+            y=volume_data['Volume'],
             name='Volume',
             yaxis='y2',
             marker_color=volume_colors,
@@ -387,9 +495,9 @@ def render_price_charts(stock_data, tech_analyzer, stock_symbol):
         ))
         
         # Volume moving average
-        volume_sma = tech_analyzer.calculate_volume_sma(stock_data['history']['Volume'])
-        fig.add_trace(go.Scatter(
-            x=stock_data['history'].index,
+        volume_sma = decimate_line(indicators['Volume_SMA'], max_points)
+        fig.add_trace(line_trace(
+            x=volume_sma.index,
             y=volume_sma,
             mode='lines',
             name='Volume SMA',
@@ -402,17 +510,18 @@ def render_price_charts(stock_data, tech_analyzer, stock_symbol):
             xaxis_title='Date',
             yaxis=dict(title='Price (₹)', side='left'),
             yaxis2=dict(title='Volume', side='right', overlaying='y'),
-            height=500
+            height=500,
+            template=template
         )
-        
-        st.plotly_chart(fig, use_container_width=True)
+    
+    return fig
 
-def render_trading_signals(stock_data, tech_analyzer):
+def render_trading_signals(stock_data, tech_analyzer, indicators=None):
     """Render trading signals and recommendations"""
     st.subheader("🎯 Trading Recommendations")
     
     # Get recent signals
-    signals = tech_analyzer.generate_signals(stock_data['history'])
+    signals = tech_analyzer.generate_signals(stock_data['history'], indicators)
     
     # Create recommendation based on signals
     signal_strength = sum(signals.values())
@@ -496,7 +605,7 @@ def render_trading_signals(stock_data, tech_analyzer):
         Please consult a financial advisor before trading.
         """)
 
-def render_voice_analysis_features(stock_symbol, tech_analyzer, stock_data, speech_handler):
+def render_voice_analysis_features(stock_symbol, tech_analyzer, stock_data, speech_handler, indicators=None):
     """Render voice-enabled analysis features"""
     st.markdown("---")
     st.subheader("🎤 Voice Analysis Features")
@@ -505,7 +614,7 @@ def render_voice_analysis_features(stock_symbol, tech_analyzer, stock_data, spee
     
     with col1:
         if st.button("🔊 Speak Technical Analysis"):
-            tech_summary = tech_analyzer.get_technical_summary(stock_data['history'])
+            tech_summary = tech_analyzer.get_technical_summary(stock_data['history'], indicators)
             speech_handler.speak_stock_analysis(stock_symbol, tech_summary)
     
     with col2:
@@ -516,7 +625,7 @@ def render_voice_analysis_features(stock_symbol, tech_analyzer, stock_data, spee
     
     with col3:
         if st.button("🔊 Speak Trading Signal"):
-            tech_summary = tech_analyzer.get_technical_summary(stock_data['history'])
+            tech_summary = tech_analyzer.get_technical_summary(stock_data['history'], indicators)
             signal = tech_summary['overall_signal']
             strength = tech_summary['signal_strength']
             signal_text = f"Trading signal for {stock_symbol.replace('.NS', '')} is {signal} with {strength:.0f} percent confidence"
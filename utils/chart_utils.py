@@ -0,0 +1,162 @@
+"""
+Helpers for building lightweight Plotly charts from long price histories
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+# Chart widths offered to users, in pixels (None draws every bar)
+CHART_WIDTHS = {
+    "Compact (800px)": 800,
+    "Standard (1280px)": 1280,
+    "Wide (1920px)": 1920,
+    "Full detail": None
+}
+
+# Horizontal pixels a candlestick needs to stay readable
+PIXELS_PER_CANDLE = 3
+
+# Line traces with more points than this are drawn with WebGL instead of SVG
+WEBGL_POINT_THRESHOLD = int(os.getenv("WEBGL_POINT_THRESHOLD", "2000"))
+
+def point_budget_for_width(width):
+    """Get the number of points worth sending for a chart of the given pixel width"""
+    return int(width) if width else None
+
+def up_down_colors(values, reference=0, up_color='green', down_color='red'):
+    """Color each bar by whether its value is at or above the reference (scalar or array)"""
+    values = np.asarray(values, dtype=float)
+    return np.where(values >= np.asarray(reference, dtype=float), up_color, down_color)
+
+def candle_colors(frame, up_color='green', down_color='red'):
+    """Color each bar by whether its session closed at or above its open"""
+    return up_down_colors(frame['Close'].to_numpy(dtype=float), frame['Open'].to_numpy(dtype=float), up_color, down_color)
+
+def line_trace(x, y, threshold=None, **kwargs):
+    """Create a line trace, switching to Scattergl when the series is dense
+
+    Both trace types take the same arguments, so callers can style and
+    place the result exactly like a go.Scatter.
+    """
+    threshold = WEBGL_POINT_THRESHOLD if threshold is None else threshold
+    trace_type = go.Scattergl if len(y) > threshold else go.Scatter
+    return trace_type(x=x, y=y, **kwargs)
+
+def lttb_indices(y, max_points):
+    """Pick the indices of max_points samples that keep a line's visual shape
+
+    Largest-Triangle-Three-Buckets: the first and last points are kept and
+    every bucket in between contributes the point forming the largest
+    triangle with its neighbours. NaN samples are never selected.
+    """
+    y = np.asarray(y, dtype=float)
+    valid = np.flatnonzero(~np.isnan(y))
+
+    if max_points is None or len(valid) <= max(max_points, 3):
+        return valid
+
+    values = y[valid]
+    positions = valid.astype(float)
+    count = len(valid)
+    edges = np.linspace(1, count - 1, max_points - 1).astype(int)
+
+    # Bucket b spans [starts[b], ends[b]), the following bucket spans [ends[b], next_ends[b])
+    starts = edges[:-1]
+    ends = np.maximum(edges[1:], starts + 1)
+    next_ends = np.maximum(edges[np.minimum(np.arange(2, max_points), max_points - 2)], ends + 1)
+
+    # Average of the following bucket is the third triangle corner, computed for all buckets at once
+    inside = next_ends <= count
+    clipped = np.minimum(next_ends, count)
+    x_sums = np.concatenate([[0.0], np.cumsum(positions)])
+    y_sums = np.concatenate([[0.0], np.cumsum(values)])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        next_x = np.where(inside, (x_sums[clipped] - x_sums[ends]) / (clipped - ends), positions[-1])
+        next_y = np.where(inside, (y_sums[clipped] - y_sums[ends]) / (clipped - ends), values[-1])
+
+    # The chosen point feeds the next bucket, so this walk stays sequential; plain floats
+    # avoid the per-bucket NumPy overhead that dominates small buckets
+    xs = positions.tolist()
+    ys = values.tolist()
+    selected = [0]
+    previous = 0
+
+    for start, end, corner_x, corner_y in zip(starts.tolist(), np.minimum(ends, count).tolist(), next_x.tolist(), next_y.tolist()):
+        previous_x, previous_y = xs[previous], ys[previous]
+        best_area = -1.0
+        for index in range(start, end):
+            area = abs((previous_x - corner_x) * (ys[index] - previous_y) - (previous_x - xs[index]) * (corner_y - previous_y))
+            if area > best_area:
+                best_area = area
+                previous = index
+        selected.append(previous)
+
+    selected.append(len(valid) - 1)
+    return valid[np.unique(selected)]
+
+def minmax_indices(y, max_points):
+    """Pick the minimum and maximum sample of each bucket so spikes survive decimation"""
+    y = np.asarray(y, dtype=float)
+
+    if max_points is None or len(y) <= max_points:
+        return np.arange(len(y))
+
+    buckets = max(max_points // 2, 1)
+    groups = np.arange(len(y)) * buckets // len(y)
+    series = pd.Series(np.nan_to_num(y, nan=0.0))
+
+    grouped = series.groupby(groups)
+    return np.unique(np.concatenate([grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()]))
+
+def decimate_line(series, max_points):
+    """Downsample a line series with LTTB"""
+    if max_points is None or len(series) <= max_points:
+        return series
+    return series.iloc[lttb_indices(series.to_numpy(dtype=float), max_points)]
+
+def decimate_bars(series, max_points):
+    """Downsample a bar series keeping each bucket's minimum and maximum"""
+    if max_points is None or len(series) <= max_points:
+        return series
+    return series.iloc[minmax_indices(series.to_numpy(dtype=float), max_points)]
+
+def aggregate_ohlc(frame, max_bars):
+    """Merge consecutive candles into at most max_bars wider candles
+
+    Each merged candle opens at its first bar's open, closes at its last
+    bar's close and spans the buckets' high/low; volume is summed.
+    """
+    if max_bars is None or len(frame) <= max_bars:
+        return frame
+
+    starts = np.unique(np.arange(len(frame)) * max_bars // len(frame), return_index=True)[1]
+    ends = np.append(starts[1:], len(frame)) - 1
+
+    aggregated = pd.DataFrame({
+        'Open': frame['Open'].to_numpy()[starts],
+        'High': np.fmax.reduceat(frame['High'].to_numpy(dtype=float), starts),
+        'Low': np.fmin.reduceat(frame['Low'].to_numpy(dtype=float), starts),
+        'Close': frame['Close'].to_numpy()[ends]
+    }, index=frame.index[starts])
+
+    if 'Volume' in frame:
+        aggregated['Volume'] = np.add.reduceat(np.nan_to_num(frame['Volume'].to_numpy(dtype=float)), starts)
+
+    return aggregated
+
+@st.cache_resource(ttl=3600, max_entries=64)  # Cache for 1 hour
+def _cached_figure(key, _build):
+    """Build a figure once per key; hits return the same object without copying it"""
+    return _build()
+
+def cached_figure(key, build):
+    """Get a figure from the figure cache, calling build() only on a miss
+
+    The key must capture everything the figure depends on, such as
+    (symbol, period, chart type, last bar, theme). The figure is shared by
+    every session and must not be modified; st.plotly_chart only reads it.
+    """
+    return _cached_figure(key, build)
@@ -7,7 +7,84 @@ import os
 import json
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.ohlcv_store import INTRADAY_MAX_PERIODS, OHLCVStore, base_period, clamp_period, slice_period
+from utils.market_breadth import MarketBreadthEngine
+from utils.quote_poller import QuotePoller
+from utils.rate_limiter import IncompleteDataError, get_provider_guard
+from utils.screener import UniverseScreener, build_snapshot
+from utils.streaming_indicators import LiveIndicatorState
+
+# Maximum number of in-flight requests per upstream provider, shared by all sessions
+PROVIDER_CONCURRENCY = {
+    'yahoo': 8,
+    'finnhub': 4
+}
+
+# Seconds a single upstream HTTP call may take
+REQUEST_TIMEOUT = 10
+
+# History downloaded for the indices, enough for both the overview and the trend chart
+INDEX_HISTORY_PERIOD = "3mo"
+
+# History downloaded for the stock universe, enough for 52-week highs and lows
+UNIVERSE_HISTORY_PERIOD = "1y"
+
+# Share of symbols a bulk download may leave empty before the download counts as failed;
+# yf.download swallows per-ticker errors, throttling included, and returns empty columns
+BULK_MAX_MISSING_FRACTION = 0.1
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+def _get_executor(provider):
+    """Get the process-wide thread pool for a provider"""
+    with _executors_lock:
+        if provider not in _executors:
+            _executors[provider] = ThreadPoolExecutor(
+                max_workers=PROVIDER_CONCURRENCY.get(provider, 4),
+                thread_name_prefix=f"{provider}-fetch"
+            )
+        return _executors[provider]
+
+def fan_out(fetch, items, provider="yahoo", timeout=20, on_progress=None):
+    """Run fetch(item) concurrently for every item on the provider's pool
+
+    Returns (results, errors). results maps every item that finished within
+    `timeout` seconds to its value, in input order; errors maps the items
+    that raised or did not finish in time to their exception. fetch runs on
+    worker threads, so it must raise instead of writing to the page.
+    on_progress(done, total) is called from the calling thread as items finish.
+    """
+    items = list(dict.fromkeys(items))
+    executor = _get_executor(provider)
+    futures = {executor.submit(fetch, item): item for item in items}
+    
+    finished = {}
+    errors = {}
+    
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            item = futures[future]
+            try:
+                finished[item] = future.result()
+            except Exception as e:
+                errors[item] = e
+            
+            if on_progress:
+                on_progress(len(finished) + len(errors), len(futures))
+    except TimeoutError:
+        # Keep what arrived in time and give up on the stragglers
+        for future, item in futures.items():
+            if not future.done():
+                future.cancel()
+                errors[item] = TimeoutError(f"{provider} request for {item} timed out after {timeout}s")
+    
+    results = {item: finished[item] for item in items if item in finished}
+    return results, errors
 
 class DataFetcher:
     def __init__(self):
@@ -15,8 +92,31 @@ class DataFetcher:
         api_key = os.getenv("FINNHUB_API_KEY", "d1kimi9r01qt8fooq9e0d1kimi9r01qt8fooq9eg")
         self.finnhub_client = finnhub.Client(api_key=api_key)
         
+        # Keep enough pooled keep-alive connections for every concurrent Finnhub worker
+        finnhub_pool = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=PROVIDER_CONCURRENCY['finnhub']
+        )
+        self.finnhub_client._session.mount("https://", finnhub_pool)
+        
+        # Shared per-provider rate limits, retries and circuit breakers
+        self.yahoo_guard = get_provider_guard('yahoo')
+        self.finnhub_guard = get_provider_guard('finnhub')
+        
         # Load comprehensive Indian stock symbols from our assets
+        self.stock_assets = self._load_stock_assets()
         self.indian_symbols = self._load_indian_stocks()
+        self.breadth_engine = MarketBreadthEngine(self.stock_assets)
+        
+        # Local bar store that survives server restarts
+        self.ohlcv_store = OHLCVStore()
+        
+        # Shared last-price table refreshed in the background for every session
+        self.quote_poller = QuotePoller(self._fetch_quote_batch)
+        
+        # Incremental intraday indicator state per symbol
+        self._live_states = {}
+        self._live_lock = threading.Lock()
         
         # Major Indian indices
         self.indices = {
@@ -26,11 +126,18 @@ class DataFetcher:
             '^CNXIT': 'NIFTY IT'
         }
         
+    def _load_stock_assets(self):
+        """Load the raw Indian stock universe definition from the assets file"""
+        try:
+            with open("assets/indian_stocks.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+    
     def _load_indian_stocks(self):
         """Load Indian stock symbols from the assets file"""
         try:
-            with open("assets/indian_stocks.json", "r", encoding="utf-8") as f:
-                stock_data = json.load(f)
+            stock_data = self.stock_assets
             
             # Combine blue chip stocks and sector-wise stocks
             symbols = {}
@@ -45,6 +152,9 @@ class DataFetcher:
                     if symbol not in symbols:  # Avoid duplicates
                         symbols[symbol] = name
             
+            if not symbols:
+                raise ValueError("No stocks found in assets file")
+            
             return symbols
             
         except Exception as e:
@@ -62,115 +172,369 @@ class DataFetcher:
                 'ASIANPAINT.NS': 'Asian Paints'
             }
     
-    @st.cache_data(ttl=300)  # Cache for 5 minutes
-    def get_stock_data(_self, symbol, period="1y"):
-        """Fetch stock data from Yahoo Finance"""
+    def get_stock_data(self, symbol, period="1y", include_info=False, interval="1d"):
+        """Fetch stock data from Yahoo Finance
+
+        Only price history is downloaded unless include_info is set, in which
+        case the company profile is attached from its own long-lived cache.
+        Intraday periods longer than Yahoo serves for the interval are clamped.
+        """
         try:
-            stock = yf.Ticker(symbol)
-            hist = stock.history(period=period)
-            info = stock.info
+            hist = self.get_price_history(symbol, period, interval)
             
-            if hist.empty:
+            if hist is None or hist.empty:
                 raise ValueError(f"No data found for symbol {symbol}")
             
             return {
                 'history': hist,
-                'info': info,
+                'info': self.get_company_profile(symbol) if include_info else {},
                 'symbol': symbol
             }
         except Exception as e:
             st.error(f"Error fetching data for {symbol}: {str(e)}")
             return None
     
+    def get_price_history(self, symbol, period="1y", interval="1d"):
+        """Get price history for a period by slicing a longer cached series of the same interval"""
+        if interval in INTRADAY_MAX_PERIODS:
+            period = clamp_period(period, interval)
+            return slice_period(self._get_intraday_history(symbol, interval), period)
+        
+        return slice_period(self._get_daily_history(symbol, base_period(period)), period)
+    
+    @st.cache_data(ttl=300)  # Cache for 5 minutes
+    def _get_daily_history(_self, symbol, period):
+        """Load a daily series for one of the shared base periods"""
+        return _self._load_history(symbol, period)
+    
+    @st.cache_data(ttl=60)  # Cache for 1 minute
+    def _get_intraday_history(_self, symbol, interval):
+        """Download the longest intraday series Yahoo Finance serves for an interval"""
+        return _self.yahoo_guard.call(
+            _self._fetch_intraday_history,
+            symbol,
+            interval,
+            stale_key=('intraday', symbol, interval)
+        )
+    
+    def _fetch_intraday_history(self, symbol, interval):
+        """Run one intraday history request, raising when it comes back empty"""
+        bars = yf.Ticker(symbol).history(period=INTRADAY_MAX_PERIODS[interval], interval=interval, timeout=REQUEST_TIMEOUT)
+        
+        # yfinance swallows most request errors and returns an empty frame instead
+        if bars is None or bars.empty:
+            raise IncompleteDataError(f"No {interval} bars found for {symbol}")
+        
+        return bars
+    
+    def _load_history(self, symbol, period, interval="1d"):
+        """Load price history through the on-disk store, downloading only the missing tail"""
+        stock = yf.Ticker(symbol)
+        stored = self.ohlcv_store.load(symbol, interval)
+        
+        if not self.ohlcv_store.covers(stored, period):
+            # Nothing stored for this far back yet, download the whole period once
+            fresh = self.yahoo_guard.call(stock.history, period=period, interval=interval, timeout=REQUEST_TIMEOUT)
+            return slice_period(self.ohlcv_store.merge(symbol, interval, fresh), period)
+        
+        try:
+            # Re-download from the last completed stored session: the partial bar gets
+            # completed and one settled bar overlaps to detect re-adjusted history
+            tail = self.yahoo_guard.call(
+                stock.history, start=stored.index[max(len(stored) - 2, 0)].date(), interval=interval, timeout=REQUEST_TIMEOUT
+            )
+        except Exception:
+            # Serve the stored bars when Yahoo is unreachable
+            tail = None
+        
+        if not self.ohlcv_store.is_consistent(stored, tail):
+            # A split or dividend re-scaled the history, the stored bars cannot be patched
+            fresh = self.yahoo_guard.call(stock.history, period=period, interval=interval, timeout=REQUEST_TIMEOUT)
+            return slice_period(self.ohlcv_store.merge(symbol, interval, fresh, replace=True), period)
+        
+        merged = self.ohlcv_store.merge(symbol, interval, tail)
+        return slice_period(merged, period)
+    
+    @st.cache_data(ttl=86400)  # Cache for 24 hours
+    def get_company_profile(_self, symbol):
+        """Fetch company metadata (sector, market cap, business summary) from Yahoo Finance"""
+        try:
+            return _self.yahoo_guard.call(lambda: yf.Ticker(symbol).info, stale_key=('info', symbol)) or {}
+        except Exception:
+            # Profile data is optional, pages render without it
+            return {}
+    
+    @st.cache_data(ttl=300)  # Cache for 5 minutes
+    def get_bulk_history(_self, symbols, period="5d", interval="1d"):
+        """Fetch price history for many symbols in one batched Yahoo Finance request
+
+        Returns a single frame keyed by (field, symbol) columns, so
+        panel['Close'][symbol] is the close series of one symbol.
+        """
+        try:
+            symbols = list(dict.fromkeys(symbols))
+            if not symbols:
+                return pd.DataFrame()
+            
+            return _self._download_panel(symbols, period, interval)
+        except Exception as e:
+            st.error(f"Error fetching bulk history: {str(e)}")
+            return pd.DataFrame()
+    
+    def _download_panel(self, symbols, period, interval, stale=True, max_missing=BULK_MAX_MISSING_FRACTION):
+        """Download a (field, symbol) history panel with batched Yahoo Finance requests, raising on failure
+
+        yf.download makes one request per symbol, so every attempt is charged
+        one token per symbol it downloads and retries only download the
+        symbols still missing. Panels missing more than max_missing of the
+        symbols fail inside the guarded call, so they are retried and count
+        towards the circuit breaker. Only complete panels are kept as stale data.
+        """
+        download = {'panel': None, 'pending': list(symbols)}
+        
+        return self.yahoo_guard.call(
+            self._fetch_panel,
+            download,
+            symbols,
+            period,
+            interval,
+            max_missing,
+            cost=lambda: len(download['pending']),
+            stale_key=('bulk', tuple(symbols), period, interval) if stale else None,
+            stale_if=lambda panel: not self._missing_symbols(panel, symbols)
+        )
+    
+    def _fetch_panel(self, download, symbols, period, interval, max_missing):
+        """Download the pending symbols, merge them into earlier attempts and check that enough came back"""
+        pending = download['pending']
+        fresh = yf.download(
+            pending,
+            period=period,
+            interval=interval,
+            group_by='column',
+            threads=True,
+            progress=False,
+            timeout=REQUEST_TIMEOUT
+        )
+        
+        if fresh is not None and not fresh.empty:
+            # Older yfinance releases flatten the columns for a single ticker
+            if not isinstance(fresh.columns, pd.MultiIndex):
+                fresh.columns = pd.MultiIndex.from_product([fresh.columns, pending])
+            
+            if download['panel'] is not None:
+                # Pending symbols only hold empty columns in the earlier attempt
+                earlier = download['panel'].drop(columns=pending, level=1, errors='ignore')
+                fresh = pd.concat([earlier, fresh], axis=1)
+            download['panel'] = fresh
+        
+        panel = download['panel']
+        if panel is None or panel.empty:
+            raise IncompleteDataError(f"No data found for {len(symbols)} symbols")
+        
+        missing = self._missing_symbols(panel, symbols)
+        download['pending'] = missing
+        if len(missing) > max_missing * len(symbols):
+            raise IncompleteDataError(f"No data for {len(missing)} of {len(symbols)} symbols: {', '.join(missing[:5])}")
+        
+        return panel.dropna(how='all')
+    
+    @staticmethod
+    def _panel_version(panel):
+        """Cache key for aggregates of a panel: changes whenever the latest bars do, not just the date"""
+        latest = pd.util.hash_pandas_object(panel.iloc[-1], index=True).sum()
+        return (panel.index[-1], len(panel), int(latest))
+    
+    @staticmethod
+    def _missing_symbols(panel, symbols):
+        """Symbols without a single close in a bulk history panel"""
+        close = panel['Close'].reindex(columns=symbols)
+        return list(close.columns[~close.notna().any()])
+    
+    @staticmethod
+    def _summarize_latest(panel):
+        """Latest close, previous close and volume per symbol from a bulk history panel"""
+        close = panel['Close']
+        valid = close.notna()
+        position = valid.cumsum()
+        count = position.iloc[-1]
+        
+        # Last and second-to-last valid bar of every symbol, independent of holidays
+        latest_mask = valid & position.eq(count)
+        prev_mask = valid & position.eq(count - 1)
+        
+        summary = pd.DataFrame({
+            'price': close.where(latest_mask).max(),
+            'prev_close': close.where(prev_mask).max(),
+            'open': panel['Open'].where(latest_mask).max() if 'Open' in panel else np.nan,
+            'volume': panel['Volume'].where(latest_mask).max()
+        })
+        summary['change'] = summary['price'] - summary['prev_close']
+        summary['change_percent'] = summary['change'] / summary['prev_close'] * 100
+        
+        return summary.dropna(subset=['price'])
+    
     @st.cache_data(ttl=600)  # Cache for 10 minutes
     def get_market_overview(_self):
         """Get market overview data"""
         try:
             overview = {}
             
-            # Fetch major indices
+            # Fetch all major indices in a single request, shared with the indices trend chart
+            panel = _self.get_bulk_history(list(_self.indices.keys()), INDEX_HISTORY_PERIOD)
+            if panel.empty:
+                return overview
+            
+            summary = _self._summarize_latest(panel)
+            
             for symbol, name in _self.indices.items():
-                data = _self.get_stock_data(symbol, "5d")
-                if data:
-                    latest = data['history'].iloc[-1]
-                    prev = data['history'].iloc[-2] if len(data['history']) > 1 else latest
-                    
-                    overview[name] = {
-                        'current': latest['Close'],
-                        'change': latest['Close'] - prev['Close'],
-                        'change_percent': ((latest['Close'] - prev['Close']) / prev['Close']) * 100,
-                        'volume': latest['Volume']
-                    }
+                if symbol not in summary.index:
+                    continue
+                row = summary.loc[symbol]
+                # With a single bar there is no previous close to compare against
+                prev_close = row['prev_close'] if pd.notna(row['prev_close']) else row['price']
+                
+                overview[name] = {
+                    'current': row['price'],
+                    'change': row['price'] - prev_close,
+                    'change_percent': ((row['price'] - prev_close) / prev_close) * 100,
+                    'volume': row['volume']
+                }
             
             return overview
         except Exception as e:
             st.error(f"Error fetching market overview: {str(e)}")
             return {}
     
-    @st.cache_data(ttl=900)  # Cache for 15 minutes
-    def get_top_gainers_losers(_self):
-        """Get top gainers and losers from Indian market"""
+    @st.cache_data(ttl=600)  # Cache for 10 minutes
+    def get_indices_history(_self, days=30):
+        """Get index closes over the last days, aligned on one calendar and rebased to 100
+
+        Reuses the overview's bulk download, so it adds no upstream request.
+        Returns a dict with 'levels' and 'rebased' frames (one column per index name).
+        """
         try:
-            gainers = []
-            losers = []
+            panel = _self.get_bulk_history(list(_self.indices.keys()), INDEX_HISTORY_PERIOD)
+            if panel.empty:
+                return {}
             
-            for symbol, name in _self.indian_symbols.items():
-                data = _self.get_stock_data(symbol, "5d")
-                if data and len(data['history']) >= 2:
-                    latest = data['history'].iloc[-1]
-                    prev = data['history'].iloc[-2]
-                    
-                    change_percent = ((latest['Close'] - prev['Close']) / prev['Close']) * 100
-                    
-                    stock_info = {
-                        'symbol': symbol,
-                        'name': name,
-                        'price': latest['Close'],
-                        'change': latest['Close'] - prev['Close'],
-                        'change_percent': change_percent,
-                        'volume': latest['Volume']
-                    }
-                    
-                    if change_percent > 0:
-                        gainers.append(stock_info)
-                    else:
-                        losers.append(stock_info)
+            closes = panel['Close'].reindex(columns=list(_self.indices.keys()))
             
-            # Sort by change percentage
-            gainers.sort(key=lambda x: x['change_percent'], reverse=True)
-            losers.sort(key=lambda x: x['change_percent'])
+            # Collapse to one row per session so indices stamped at different times line up
+            closes.index = pd.DatetimeIndex(closes.index).tz_localize(None).normalize()
+            closes = closes.groupby(level=0).last().ffill()
+            closes = closes[closes.index >= closes.index[-1] - pd.Timedelta(days=days)]
+            closes = closes.dropna(axis=1, how='all').rename(columns=_self.indices)
             
-            return gainers[:5], losers[:5]
+            return {
+                'levels': closes,
+                'rebased': closes.div(closes.bfill().iloc[0]) * 100
+            }
+        except Exception as e:
+            st.error(f"Error fetching indices history: {str(e)}")
+            return {}
+    
+    def get_universe_panel(self):
+        """Get one year of daily bars for the whole stock universe in a single batched request"""
+        return self.get_bulk_history(list(self.indian_symbols.keys()), UNIVERSE_HISTORY_PERIOD)
+    
+    def get_market_breadth(self):
+        """Get advance/decline, 52-week highs/lows and market-cap bucket returns for the stock universe"""
+        try:
+            panel = self.get_universe_panel()
+            if panel.empty:
+                return {}
+            
+            return self._compute_market_breadth(self._panel_version(panel), panel)
+        except Exception as e:
+            st.error(f"Error computing market breadth: {str(e)}")
+            return {}
+    
+    @st.cache_data(ttl=300)  # Cache for 5 minutes, the lifetime of the universe panel
+    def _compute_market_breadth(_self, version, _panel):
+        """Compute breadth once per universe panel refresh"""
+        summary = _self._summarize_latest(_panel).dropna(subset=['prev_close'])
+        return _self.breadth_engine.compute(_panel, summary)
+    
+    def get_screener(self):
+        """Get a screener over the latest snapshot of the whole stock universe, or None without data"""
+        panel = self.get_universe_panel()
+        if panel.empty:
+            return None
+        
+        return UniverseScreener(self._build_universe_snapshot(self._panel_version(panel), panel))
+    
+    @st.cache_data(ttl=300)  # Cache for 5 minutes, the lifetime of the universe panel
+    def _build_universe_snapshot(_self, version, _panel):
+        """Build the columnar per-symbol snapshot every screen ranks from"""
+        summary = _self._summarize_latest(_panel).dropna(subset=['prev_close'])
+        return build_snapshot(_panel, summary, _self.indian_symbols)
+    
+    def get_top_gainers_losers(self):
+        """Get top gainers and losers from Indian market"""
+        try:
+            screener = self.get_screener()
+            if screener is None:
+                return [], []
+            
+            return screener.top_gainers_losers(5)
         except Exception as e:
             st.error(f"Error fetching gainers/losers: {str(e)}")
             return [], []
     
+    def _fetch_company_news(self, symbol, days=7):
+        """Fetch company news from Finnhub, raising on failure"""
+        # Convert Yahoo Finance symbol to Finnhub format
+        finnhub_symbol = symbol.replace('.NS', '').replace('.BO', '')
+        
+        # Calculate date range
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        
+        # Get news from Finnhub
+        news = self.finnhub_guard.call(
+            self.finnhub_client.company_news,
+            finnhub_symbol, 
+            _from=start_date.strftime('%Y-%m-%d'), 
+            to=end_date.strftime('%Y-%m-%d'),
+            stale_key=('company_news', finnhub_symbol, days)
+        )
+        
+        return news[:10]  # Return top 10 news items
+    
     def get_company_news(self, symbol, days=7):
         """Fetch company news from Finnhub"""
         try:
-            # Convert Yahoo Finance symbol to Finnhub format
-            finnhub_symbol = symbol.replace('.NS', '').replace('.BO', '')
-            
-            # Calculate date range
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            
-            # Get news from Finnhub
-            news = self.finnhub_client.company_news(
-                finnhub_symbol, 
-                _from=start_date.strftime('%Y-%m-%d'), 
-                to=end_date.strftime('%Y-%m-%d')
-            )
-            
-            return news[:10]  # Return top 10 news items
+            return self._fetch_company_news(symbol, days)
         except Exception as e:
             st.error(f"Error fetching news for {symbol}: {str(e)}")
             return []
     
+    def get_news_for_symbols(self, symbols, days=7, on_progress=None):
+        """Fetch company news for several symbols concurrently
+
+        Symbols whose request fails or times out are skipped.
+        """
+        results, errors = fan_out(
+            lambda symbol: self._fetch_company_news(symbol, days),
+            symbols,
+            provider="finnhub",
+            on_progress=on_progress
+        )
+        
+        news = []
+        for symbol_news in results.values():
+            news.extend(symbol_news)
+        
+        return news
+    
     def get_general_market_news(self, category="general"):
         """Fetch general market news"""
         try:
-            news = self.finnhub_client.general_news(category, min_id=0)
+            news = self.finnhub_guard.call(
+                self.finnhub_client.general_news, category, min_id=0,
+                stale_key=('general_news', category)
+            )
             # Filter for Indian market related news
             indian_keywords = ['india', 'indian', 'nse', 'bse', 'mumbai', 'sensex', 'nifty', 'rupee']
             filtered_news = []
@@ -186,71 +550,106 @@ class DataFetcher:
             st.error(f"Error fetching general news: {str(e)}")
             return []
     
-    @st.cache_data(ttl=3600)  # Cache for 1 hour
-    def get_sector_performance(_self):
-        """Get sector-wise performance data"""
+    def get_sector_performance(self):
+        """Get sector-wise performance data, overall and per market-cap bucket"""
         try:
-            sectors = {
-                'Banking': ['HDFCBANK.NS', 'KOTAKBANK.NS', 'ICICIBANK.NS'],
-                'IT': ['TCS.NS', 'INFY.NS', 'WIPRO.NS'],
-                'FMCG': ['HINDUNILVR.NS', 'ITC.NS', 'NESTLEIND.NS'],
-                'Energy': ['RELIANCE.NS', 'ONGC.NS', 'NTPC.NS'],
-                'Auto': ['MARUTI.NS', 'TATAMOTORS.NS', 'M&M.NS']
-            }
-            
-            sector_data = {}
+            panel = self.get_universe_panel()
+            if panel.empty:
+                return {}
             
-            for sector, symbols in sectors.items():
-                sector_changes = []
-                for symbol in symbols:
-                    data = _self.get_stock_data(symbol, "5d")
-                    if data and len(data['history']) >= 2:
-                        latest = data['history'].iloc[-1]
-                        prev = data['history'].iloc[-2]
-                        change_percent = ((latest['Close'] - prev['Close']) / prev['Close']) * 100
-                        sector_changes.append(change_percent)
-                
-                if sector_changes:
-                    sector_data[sector] = {
-                        'avg_change': np.mean(sector_changes),
-                        'stocks_count': len(sector_changes)
-                    }
-            
-            return sector_data
+            return self._compute_sector_performance(self._panel_version(panel), panel)
         except Exception as e:
             st.error(f"Error fetching sector performance: {str(e)}")
             return {}
     
-    def get_real_time_quote(self, symbol):
-        """Get real-time quote data"""
-        try:
-            # For Indian stocks, use Yahoo Finance for real-time data
-            stock = yf.Ticker(symbol)
+    @st.cache_data(ttl=300)  # Cache for 5 minutes, the lifetime of the universe panel
+    def _compute_sector_performance(_self, version, _panel):
+        """Aggregate the universe panel by sector and cap bucket once per panel refresh"""
+        summary = _self._summarize_latest(_panel).dropna(subset=['prev_close'])
+        sectors = _self.breadth_engine.sector_members(_self.stock_assets)
+        return _self.breadth_engine.sector_breakdown(_panel, summary, sectors)
+    
+    def _fetch_quote_batch(self, symbols):
+        """Fetch the latest quote of several symbols in one request, raising on failure
+
+        Uses today's 1-minute bars and falls back to daily bars for symbols
+        without intraday data outside market hours.
+        """
+        quotes = {}
+        error = None
+        
+        # Symbols without intraday bars are expected, the daily pass fills them in
+        for period, interval, max_missing in (("1d", "1m", 1.0), ("5d", "1d", BULK_MAX_MISSING_FRACTION)):
+            missing = [symbol for symbol in symbols if symbol not in quotes]
+            if not missing:
+                break
+            
+            try:
+                panel = self._download_panel(missing, period, interval, stale=False, max_missing=max_missing)
+            except IncompleteDataError as e:
+                error = e
+                continue
             
-            # Get current market data
-            todays_data = stock.history(period="1d", interval="1m")
-            if not todays_data.empty:
-                latest = todays_data.iloc[-1]
-                return {
-                    'price': latest['Close'],
-                    'volume': latest['Volume'],
-                    'timestamp': todays_data.index[-1]
+            close = panel['Close']
+            valid = close.notna()
+            # Row of the last valid bar per symbol: the first row where the running count peaks
+            last_rows = valid.cumsum().idxmax()
+            
+            for symbol in close.columns[valid.any()]:
+                timestamp = last_rows[symbol]
+                quotes[symbol] = {
+                    'price': close.at[timestamp, symbol],
+                    'volume': panel['Volume'].at[timestamp, symbol],
+                    'timestamp': timestamp
                 }
-            else:
-                # Fallback to daily data
-                data = self.get_stock_data(symbol, "1d")
-                if data:
-                    latest = data['history'].iloc[-1]
-                    return {
-                        'price': latest['Close'],
-                        'volume': latest['Volume'],
-                        'timestamp': data['history'].index[-1]
-                    }
-            return None
+        
+        if not quotes and error is not None:
+            # Let the poller keep its previous quotes and record the failure
+            raise error
+        
+        return quotes
+    
+    def get_real_time_quote(self, symbol):
+        """Get real-time quote data from the shared background poller"""
+        try:
+            return self.quote_poller.get(symbol)
         except Exception as e:
             st.error(f"Error fetching real-time quote for {symbol}: {str(e)}")
             return None
     
+    def get_real_time_quotes(self, symbols, on_progress=None):
+        """Get real-time quotes for several symbols from the shared background poller
+
+        Returns a dict of symbol to quote; symbols without a quote are left out.
+        """
+        quotes = self.quote_poller.get_many(list(symbols))
+        if on_progress:
+            on_progress(len(symbols), len(symbols))
+        return quotes
+    
+    def get_live_indicators(self, symbol):
+        """Get intraday indicators for a symbol from its 1-minute bars
+
+        Bars come from the shared 1-minute intraday cache, so sessions add no
+        Yahoo Finance requests of their own. Indicator state is kept per
+        symbol and only bars newer than the last update are fed in. The
+        still-forming latest bar is left out until it completes.
+        """
+        try:
+            bars = slice_period(self._get_intraday_history(symbol, "1m"), "1d")
+            if bars is None or bars.empty:
+                return None
+            
+            with self._live_lock:
+                if symbol not in self._live_states:
+                    self._live_states[symbol] = LiveIndicatorState()
+                state = self._live_states[symbol]
+                state.sync(bars['Close'].iloc[:-1])
+                return state.snapshot()
+        except Exception as e:
+            st.error(f"Error fetching live indicators for {symbol}: {str(e)}")
+            return None
+    
     def search_stocks(self, query):
         """Search for stocks based on query"""
         try:
@@ -271,3 +670,8 @@ class DataFetcher:
         except Exception as e:
             st.error(f"Error searching stocks: {str(e)}")
             return []
+
+@st.cache_resource
+def get_data_fetcher():
+    """Get the DataFetcher shared by every session of this server process"""
+    return DataFetcher()
@@ -0,0 +1,109 @@
+"""
+Lexicon-based sentiment scoring, vectorized over a whole batch of texts
+"""
+
+import re
+import threading
+import numpy as np
+from typing import List, Tuple
+
+# Splits "don't" into "do" + "n't" like TextBlob's tokenizer, so negations are seen
+TOKEN_PATTERN = re.compile(r"n't|\w+(?=n't)|[\w'-]+")
+
+NEGATIONS = ('no', 'not', "n't", 'never')
+
+# TextBlob treats a negated word as slightly opposite ("not good" is mildly bad)
+NEGATION_FACTOR = -0.5
+
+class LexiconSentimentEngine:
+    """Approximate TextBlob's pattern sentiment with array lookups instead of per-text parsing
+
+    Uses the polarity/subjectivity/intensity lexicon that ships with
+    TextBlob. Every text is tokenized once and mapped to lexicon ids. Then
+    the whole batch is scored with NumPy: adverb modifiers scale the next
+    word, negations flip it, and per-text averages come from np.bincount.
+    """
+
+    def __init__(self):
+        from textblob.en import sentiment as pattern_lexicon
+
+        pattern_lexicon.load()
+
+        words = []
+        values = []
+        modifiers = []
+        for word, entries in pattern_lexicon.items():
+            # TextBlob scores untagged text with the part-of-speech independent entry
+            if None not in entries:
+                continue
+            words.append(word)
+            values.append(entries[None])
+            modifiers.append(any(tag in entries for tag in pattern_lexicon.modifiers))
+
+        self.vocabulary = {word: index for index, word in enumerate(words)}
+        values = np.array(values, dtype=float).reshape(-1, 3)
+        self.polarity = values[:, 0]
+        self.subjectivity = values[:, 1]
+        self.intensity = values[:, 2]
+        self.is_modifier = np.array(modifiers, dtype=bool)
+
+        # Negations get ids past the lexicon so they can be found in the id array
+        self.negation_ids = {word: len(words) + offset for offset, word in enumerate(NEGATIONS)}
+
+    def _encode(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Tokenize every text once into flat (lexicon id, text index) arrays; unknown words get -1"""
+        ids = []
+        owners = []
+        for index, text in enumerate(texts):
+            for token in TOKEN_PATTERN.findall(text.lower()):
+                ids.append(self.vocabulary.get(token, self.negation_ids.get(token, -1)))
+                owners.append(index)
+        return np.array(ids, dtype=np.int64), np.array(owners, dtype=np.int64)
+
+    def score(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (polarity, subjectivity) arrays for a batch of texts"""
+        count = len(texts)
+        ids, owners = self._encode(texts)
+        if count == 0 or len(ids) == 0:
+            return np.zeros(count), np.zeros(count)
+
+        known = (ids >= 0) & (ids < len(self.vocabulary))
+        safe_ids = np.where(known, ids, 0)
+        negation = ids >= len(self.vocabulary)
+
+        # Previous token in the same text
+        previous = np.roll(np.arange(len(ids)), 1)
+        has_previous = np.r_[False, owners[1:] == owners[:-1]]
+
+        # A known adverb directly before a known word modifies it and is not scored on its own
+        modified = known & has_previous & known[previous] & self.is_modifier[safe_ids[previous]]
+        consumed = np.zeros(len(ids), dtype=bool)
+        consumed[previous[modified]] = True
+        counted = known & ~consumed
+
+        factor = np.where(modified, self.intensity[safe_ids[previous]], 1.0)
+        polarity = np.clip(self.polarity[safe_ids] * factor, -1.0, 1.0)
+        subjectivity = np.clip(self.subjectivity[safe_ids] * factor, -1.0, 1.0)
+
+        # Negation right before the word, or before its modifier ("not very good")
+        modifier_position = np.where(modified, previous, np.arange(len(ids)))
+        negated = (has_previous[modifier_position] & negation[previous[modifier_position]])
+        polarity = np.where(negated, polarity * NEGATION_FACTOR, polarity)
+
+        matches = np.bincount(owners[counted], minlength=count)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_polarity = np.bincount(owners[counted], weights=polarity[counted], minlength=count) / matches
+            mean_subjectivity = np.bincount(owners[counted], weights=subjectivity[counted], minlength=count) / matches
+
+        return np.nan_to_num(mean_polarity), np.nan_to_num(mean_subjectivity)
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_lexicon_engine():
+    """Get the process-wide lexicon engine, loading the lexicon on first use"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = LexiconSentimentEngine()
+        return _engine
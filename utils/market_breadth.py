@@ -0,0 +1,127 @@
+"""
+Market breadth and market-cap bucket statistics over a bulk history panel
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+CAP_BUCKETS = ['Large Cap', 'Mid Cap', 'Small Cap']
+
+class MarketBreadthEngine:
+    """Breadth statistics for a symbol universe, computed column-wise over a (time, symbol) panel
+
+    Market-cap buckets come from the assets file: blue chip stocks carry a
+    market_cap_category and market_cap_categories lists examples. Yahoo's
+    bulk download has no market capitalisation, so symbols without a tag are
+    split into buckets by median traded value (close x volume).
+    """
+
+    def __init__(self, stock_assets: Dict):
+        self.cap_tags = {}
+
+        for category, details in stock_assets.get("market_cap_categories", {}).items():
+            for symbol in details.get("examples", []):
+                self.cap_tags[symbol] = category
+
+        for symbol, details in stock_assets.get("blue_chip_stocks", {}).items():
+            if details.get("market_cap_category") in CAP_BUCKETS:
+                self.cap_tags[symbol] = details["market_cap_category"]
+
+    def traded_value(self, panel: pd.DataFrame) -> pd.Series:
+        """Median daily traded value per symbol, a liquidity proxy for company size"""
+        return (panel['Close'] * panel['Volume']).median()
+
+    def cap_buckets(self, symbols: List[str], traded_value: pd.Series) -> pd.Series:
+        """Assign every symbol to a market-cap bucket"""
+        buckets = pd.Series([self.cap_tags.get(symbol) for symbol in symbols], index=symbols, dtype=object)
+        untagged = buckets.isna() & traded_value.reindex(symbols).notna()
+
+        if untagged.any():
+            # Terciles of traded value, largest third first
+            ranks = traded_value.reindex(symbols)[untagged].rank(ascending=False, pct=True)
+            buckets[untagged] = np.select([ranks <= 1 / 3, ranks <= 2 / 3], CAP_BUCKETS[:2], CAP_BUCKETS[2])
+
+        return buckets
+
+    def compute(self, panel: pd.DataFrame, summary: pd.DataFrame) -> Dict:
+        """Compute advance/decline counts, 52-week highs/lows and cap-bucket returns
+
+        summary is the per-symbol latest/previous close frame of the panel
+        with a change_percent column.
+        """
+        changes = summary['change_percent'].dropna()
+        direction = np.sign(changes.round(2).to_numpy())
+
+        # A symbol sets a new high/low when its latest bar reaches the extreme of the whole window
+        high = panel['High'].reindex(columns=changes.index).to_numpy(dtype=float)
+        low = panel['Low'].reindex(columns=changes.index).to_numpy(dtype=float)
+        with np.errstate(invalid='ignore'):
+            new_highs = high[-1] >= np.nanmax(high, axis=0)
+            new_lows = low[-1] <= np.nanmin(low, axis=0)
+
+        buckets = self.cap_buckets(list(changes.index), self.traded_value(panel))
+        cap_returns = changes.groupby(buckets).mean().reindex(CAP_BUCKETS)
+
+        return {
+            'advances': int((direction > 0).sum()),
+            'declines': int((direction < 0).sum()),
+            'unchanged': int((direction == 0).sum()),
+            'new_highs': int(new_highs.sum()),
+            'new_lows': int(new_lows.sum()),
+            'cap_returns': {bucket: value for bucket, value in cap_returns.items() if pd.notna(value)},
+            'cap_counts': buckets.value_counts().reindex(CAP_BUCKETS, fill_value=0).to_dict(),
+            'symbols': len(changes),
+            'session': panel.index[-1]
+        }
+
+    def sector_members(self, stock_assets: Dict) -> Dict[str, List[str]]:
+        """Map every sector to its symbols: sector_wise_stocks first, then untracked blue chips"""
+        sectors = {sector: list(stocks) for sector, stocks in stock_assets.get("sector_wise_stocks", {}).items()}
+        listed = {symbol for symbols in sectors.values() for symbol in symbols}
+
+        for symbol, details in stock_assets.get("blue_chip_stocks", {}).items():
+            if symbol not in listed and details.get("sector"):
+                sectors.setdefault(details["sector"], []).append(symbol)
+
+        return sectors
+
+    def sector_breakdown(self, panel: pd.DataFrame, summary: pd.DataFrame, sectors: Dict[str, List[str]]) -> Dict:
+        """Aggregate daily returns by sector and by sector x cap bucket
+
+        Both an equal-weighted and a traded-value-weighted return are
+        produced; traded value stands in for market cap, which the bulk
+        download does not carry.
+        """
+        changes = summary['change_percent'].dropna()
+        traded_value = self.traded_value(panel)
+
+        pairs = [(sector, symbol) for sector, symbols in sectors.items() for symbol in symbols if symbol in changes.index]
+        if not pairs:
+            return {}
+
+        frame = pd.DataFrame(pairs, columns=['sector', 'symbol'])
+        frame['change'] = changes.reindex(frame['symbol']).to_numpy()
+        frame['weight'] = traded_value.reindex(frame['symbol']).fillna(0).to_numpy()
+        frame['bucket'] = self.cap_buckets(list(changes.index), traded_value).reindex(frame['symbol']).to_numpy()
+        frame['weighted_change'] = frame['change'] * frame['weight']
+
+        by_sector = frame.groupby('sector', sort=False)
+        by_cell = frame.groupby(['sector', 'bucket'])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sector_weighted = by_sector['weighted_change'].sum() / by_sector['weight'].sum()
+            cell_weighted = (by_cell['weighted_change'].sum() / by_cell['weight'].sum()).unstack()
+        cell_equal = by_cell['change'].mean().unstack()
+
+        breakdown = {}
+        for sector, stocks in by_sector:
+            breakdown[sector] = {
+                'avg_change': stocks['change'].mean(),
+                'weighted_change': sector_weighted[sector],
+                'stocks_count': len(stocks),
+                'cap_changes': cell_equal.loc[sector].reindex(CAP_BUCKETS).to_dict(),
+                'cap_changes_weighted': cell_weighted.loc[sector].reindex(CAP_BUCKETS).to_dict()
+            }
+
+        return breakdown
@@ -5,10 +5,62 @@ import re
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple
 import requests
-from collections import Counter
+import os
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from utils.lexicon_sentiment import get_lexicon_engine
+from utils.sentiment_workers import score_texts_parallel
+
+# Sentiment engines: TextBlob's full parser or the vectorized lexicon scorer
+SENTIMENT_ENGINES = ('textblob', 'lexicon')
+DEFAULT_SENTIMENT_ENGINE = os.getenv("SENTIMENT_ENGINE", "textblob")
+
+# Analyzed articles kept in memory, shared by every session of the process
+ARTICLE_CACHE_SIZE = 2048
+
+class ArticleAnalysisCache:
+    """Thread-safe LRU cache of per-article analysis results"""
+    
+    def __init__(self, maxsize: int = ARTICLE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+    
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+_article_cache = ArticleAnalysisCache()
+
+def article_cache_key(news_item: Dict) -> Tuple:
+    """Key an article by its Finnhub id, or by a hash of its text when it has none"""
+    if news_item.get('id'):
+        return ('id', news_item['id'])
+    
+    text = f"{news_item.get('headline', '')}\n{news_item.get('summary', '')}"
+    return ('text', hashlib.sha1(text.encode('utf-8')).hexdigest())
 
 class NewsAnalyzer:
-    def __init__(self):
+    def __init__(self, sentiment_engine: str = None):
+        self.sentiment_engine = sentiment_engine or DEFAULT_SENTIMENT_ENGINE
+        if self.sentiment_engine not in SENTIMENT_ENGINES:
+            raise ValueError(f"Unknown sentiment engine: {self.sentiment_engine}")
+        
         self.positive_keywords = [
             'growth', 'profit', 'gain', 'rise', 'increase', 'bullish', 'positive',
             'strong', 'boost', 'surge', 'rally', 'upgrade', 'buy', 'outperform'
@@ -31,35 +83,129 @@ class NewsAnalyzer:
             'adani': 'ADANIENT.NS',
             'tata': 'TATAMOTORS.NS'
         }
+        
+        # Checked in order, the first category with a matching keyword wins
+        self.categories = {
+            'Earnings': ['earnings', 'profit', 'revenue', 'quarterly', 'annual', 'results'],
+            'Merger & Acquisition': ['merger', 'acquisition', 'takeover', 'buyout', 'deal'],
+            'Market News': ['market', 'trading', 'index', 'nifty', 'sensex', 'exchange'],
+            'Policy & Regulation': ['policy', 'regulation', 'government', 'rbi', 'sebi', 'ministry'],
+            'Technology': ['technology', 'digital', 'ai', 'automation', 'tech', 'innovation'],
+            'Banking & Finance': ['bank', 'finance', 'loan', 'credit', 'npa', 'deposit'],
+            'Energy': ['oil', 'gas', 'renewable', 'solar', 'energy', 'power'],
+            'Auto': ['auto', 'car', 'vehicle', 'automobile', 'ev', 'electric'],
+            'Pharma & Healthcare': ['pharma', 'drug', 'medicine', 'healthcare', 'hospital'],
+            'Real Estate': ['real estate', 'property', 'housing', 'construction', 'builder']
+        }
+        
+        # Verb forms that count as their impact keyword; other keywords only match as-is or plural
+        self.keyword_inflections = {
+            'gain': ['gained', 'gaining'],
+            'rise': ['rising', 'rose', 'risen'],
+            'increase': ['increased', 'increasing'],
+            'boost': ['boosted', 'boosting'],
+            'surge': ['surged', 'surging'],
+            'rally': ['rallied', 'rallying'],
+            'upgrade': ['upgraded', 'upgrading'],
+            'buy': ['buying', 'bought'],
+            'outperform': ['outperformed', 'outperforming'],
+            'decline': ['declined', 'declining'],
+            'fall': ['falling', 'fell', 'fallen'],
+            'drop': ['dropped', 'dropping'],
+            'crash': ['crashed', 'crashing'],
+            'plunge': ['plunged', 'plunging'],
+            'downgrade': ['downgraded', 'downgrading'],
+            'sell': ['selling', 'sold'],
+            'underperform': ['underperformed', 'underperforming']
+        }
+        
+        # Names, acronyms, adjectives and mass nouns among the keywords that never take a plural
+        self.singular_keywords = {
+            'nifty', 'sensex', 'rbi', 'sebi', 'npa', 'bullish', 'bearish', 'strong', 'weak', 'growth',
+            'annual', 'quarterly', 'digital', 'ai', 'tech', 'automation', 'electric', 'healthcare', 'pharma',
+            'oil', 'solar', 'trading', 'housing', 'construction', 'real estate'
+        }
+        
+        self._build_keyword_matcher()
+    
+    def _plural(self, keyword: str):
+        """Regular English plural of an impact or category keyword, or None when it takes none"""
+        if keyword in self.singular_keywords or (keyword.endswith('s') and not keyword.endswith('ss')):
+            # Names, acronyms and words that are already plural ('earnings', 'results')
+            return None
+        if keyword.endswith(('s', 'x', 'ch', 'sh', 'z')):
+            return keyword + 'es'
+        if keyword.endswith('y') and keyword[-2:-1] not in 'aeiou':
+            return keyword[:-1] + 'ies'
+        return keyword + 's'
+    
+    def _build_keyword_matcher(self):
+        """Compile every impact, category and company keyword into one word-boundary regex
+        
+        Keywords match as whole words, their plural or a listed verb form, so
+        'profits' counts as 'profit' but 'car' does not match 'caring' or 'card'.
+        Companies match by name or by their joined NSE ticker ('hdfcbank').
+        """
+        sources = []
+        for keyword in self.positive_keywords:
+            sources.append((keyword, ('positive', keyword)))
+        for keyword in self.negative_keywords:
+            sources.append((keyword, ('negative', keyword)))
+        for category, keywords in self.categories.items():
+            for keyword in keywords:
+                sources.append((keyword, ('category', category)))
+        
+        # Plurals and verb forms share the role of their keyword
+        self._keyword_roles = {}
+        for keyword, role in sources:
+            forms = [keyword, self._plural(keyword)] + self.keyword_inflections.get(keyword, [])
+            for form in forms:
+                if form and role not in self._keyword_roles.setdefault(form, []):
+                    self._keyword_roles[form].append(role)
+        
+        for company, symbol in self.indian_companies.items():
+            for form in (company, symbol.split('.')[0].lower()):
+                if ('company', symbol) not in self._keyword_roles.setdefault(form, []):
+                    self._keyword_roles[form].append(('company', symbol))
+        
+        # Longest forms first so multi-word and longer terms are tried before their prefixes
+        alternatives = '|'.join(re.escape(form) for form in sorted(self._keyword_roles, key=len, reverse=True))
+        self._keyword_pattern = re.compile(rf"\b({alternatives})\b")
+    
+    def scan_keywords(self, text: str) -> Dict:
+        """Find market impact, category and mentioned companies in a single pass over the text"""
+        positive = set()
+        negative = set()
+        categories = set()
+        companies = set()
+        
+        for match in self._keyword_pattern.finditer(text.lower()):
+            for role, value in self._keyword_roles[match.group(1)]:
+                if role == 'positive':
+                    positive.add(value)
+                elif role == 'negative':
+                    negative.add(value)
+                elif role == 'category':
+                    categories.add(value)
+                else:
+                    companies.add(value)
+        
+        category = next((name for name in self.categories if name in categories), 'General')
+        
+        return {
+            'market_impact': self._score_market_impact(len(positive), len(negative)),
+            'category': category,
+            'mentioned_companies': list(companies)
+        }
     
     def analyze_sentiment(self, text: str) -> Dict:
-        """Analyze sentiment of news text using TextBlob"""
+        """Analyze sentiment of news text using TextBlob or the lexicon engine"""
+        if self.sentiment_engine == 'lexicon':
+            return self.analyze_sentiment_batch([text])[0]
+        
         try:
             blob = TextBlob(text)
-            polarity = blob.sentiment.polarity
-            subjectivity = blob.sentiment.subjectivity
-            
-            # Convert polarity to sentiment label
-            if polarity > 0.1:
-                sentiment = 'Positive'
-                emoji = '📈'
-            elif polarity < -0.1:
-                sentiment = 'Negative'
-                emoji = '📉'
-            else:
-                sentiment = 'Neutral'
-                emoji = '➡️'
-            
-            # Calculate confidence based on subjectivity
-            confidence = (1 - subjectivity) * 100
-            
-            return {
-                'sentiment': sentiment,
-                'polarity': polarity,
-                'subjectivity': subjectivity,
-                'confidence': confidence,
-                'emoji': emoji
-            }
+            return self._label_sentiment(blob.sentiment.polarity, blob.sentiment.subjectivity)
         except Exception as e:
             st.error(f"Error analyzing sentiment: {str(e)}")
             return {
@@ -70,13 +216,58 @@ class NewsAnalyzer:
                 'emoji': '➡️'
             }
     
-    def extract_market_impact_keywords(self, text: str) -> Dict:
-        """Extract market impact keywords from news text"""
-        text_lower = text.lower()
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict]:
+        """Analyze sentiment of many texts, spread over a process pool for large batches
+        
+        Results come back in input order; small batches are scored in-process.
+        The lexicon engine scores the whole batch in one vectorized pass instead.
+        """
+        if not texts:
+            return []
+        
+        if self.sentiment_engine == 'lexicon':
+            # One vectorized pass over the whole batch, no worker processes needed
+            polarity, subjectivity = get_lexicon_engine().score(list(texts))
+            return [self._label_sentiment(float(p), float(s)) for p, s in zip(polarity, subjectivity)]
+        
+        try:
+            scores = score_texts_parallel(list(texts))
+        except Exception:
+            # Score one by one so a single bad text only neutralizes itself
+            return [self.analyze_sentiment(text) for text in texts]
+        
+        return [self._label_sentiment(polarity, subjectivity) for polarity, subjectivity in scores]
+    
+    def _label_sentiment(self, polarity: float, subjectivity: float) -> Dict:
+        """Turn TextBlob polarity and subjectivity into the sentiment result shape"""
+        # Convert polarity to sentiment label
+        if polarity > 0.1:
+            sentiment = 'Positive'
+            emoji = '📈'
+        elif polarity < -0.1:
+            sentiment = 'Negative'
+            emoji = '📉'
+        else:
+            sentiment = 'Neutral'
+            emoji = '➡️'
         
-        positive_count = sum(1 for keyword in self.positive_keywords if keyword in text_lower)
-        negative_count = sum(1 for keyword in self.negative_keywords if keyword in text_lower)
+        # Calculate confidence based on subjectivity
+        confidence = (1 - subjectivity) * 100
         
+        return {
+            'sentiment': sentiment,
+            'polarity': polarity,
+            'subjectivity': subjectivity,
+            'confidence': confidence,
+            'emoji': emoji
+        }
+    
+    def extract_market_impact_keywords(self, text: str) -> Dict:
+        """Extract market impact keywords from news text"""
+        return self.scan_keywords(text)['market_impact']
+    
+    def _score_market_impact(self, positive_count: int, negative_count: int) -> Dict:
+        """Turn distinct positive/negative keyword counts into a market impact label"""
         impact_score = positive_count - negative_count
         
         if impact_score > 0:
@@ -99,39 +290,53 @@ class NewsAnalyzer:
     
     def categorize_news(self, news_item: Dict) -> str:
         """Categorize news into different types"""
-        headline = news_item.get('headline', '').lower()
-        summary = news_item.get('summary', '').lower()
-        text = f"{headline} {summary}"
+        headline = news_item.get('headline', '')
+        summary = news_item.get('summary', '')
+        return self.scan_keywords(f"{headline} {summary}")['category']
+    
+    def extract_mentioned_companies(self, text: str) -> List[str]:
+        """Extract mentioned Indian companies from news text"""
+        return self.scan_keywords(text)['mentioned_companies']
+    
+    def analyze_article(self, news_item: Dict) -> Dict:
+        """Analyze one article's sentiment, market impact, category and companies
         
-        categories = {
-            'Earnings': ['earnings', 'profit', 'revenue', 'quarterly', 'annual', 'results'],
-            'Merger & Acquisition': ['merger', 'acquisition', 'takeover', 'buyout', 'deal'],
-            'Market News': ['market', 'trading', 'index', 'nifty', 'sensex', 'exchange'],
-            'Policy & Regulation': ['policy', 'regulation', 'government', 'rbi', 'sebi', 'ministry'],
-            'Technology': ['technology', 'digital', 'ai', 'automation', 'tech', 'innovation'],
-            'Banking & Finance': ['bank', 'finance', 'loan', 'credit', 'npa', 'deposit'],
-            'Energy': ['oil', 'gas', 'renewable', 'solar', 'energy', 'power'],
-            'Auto': ['auto', 'car', 'vehicle', 'automobile', 'ev', 'electric'],
-            'Pharma & Healthcare': ['pharma', 'drug', 'medicine', 'healthcare', 'hospital'],
-            'Real Estate': ['real estate', 'property', 'housing', 'construction', 'builder']
-        }
+        Results are memoized process-wide, so an unchanged feed is re-analyzed
+        with cache lookups only.
+        """
+        key = (self.sentiment_engine,) + article_cache_key(news_item)
+        analysis = _article_cache.get(key)
         
-        for category, keywords in categories.items():
-            if any(keyword in text for keyword in keywords):
-                return category
+        if analysis is None:
+            headline = news_item.get('headline', '')
+            summary = news_item.get('summary', '')
+            text = f"{headline} {summary}"
+            
+            analysis = {'sentiment': self.analyze_sentiment(text), **self.scan_keywords(text)}
+            _article_cache.put(key, analysis)
         
-        return 'General'
+        # Cached entries are shared between sessions, hand out copies
+        return {
+            'sentiment': dict(analysis['sentiment']),
+            'market_impact': dict(analysis['market_impact']),
+            'category': analysis['category'],
+            'mentioned_companies': list(analysis['mentioned_companies'])
+        }
     
-    def extract_mentioned_companies(self, text: str) -> List[str]:
-        """Extract mentioned Indian companies from news text"""
-        text_lower = text.lower()
-        mentioned = []
+    def _prime_article_cache(self, news_list: List[Dict]):
+        """Analyze uncached articles together so sentiment scoring can use the process pool"""
+        pending = {}
+        for news_item in news_list:
+            key = (self.sentiment_engine,) + article_cache_key(news_item)
+            if key not in pending and _article_cache.get(key) is None:
+                pending[key] = f"{news_item.get('headline', '')} {news_item.get('summary', '')}"
         
-        for company, symbol in self.indian_companies.items():
-            if company in text_lower:
-                mentioned.append(symbol)
+        if not pending:
+            return
         
-        return list(set(mentioned))  # Remove duplicates
+        sentiments = self.analyze_sentiment_batch(list(pending.values()))
+        for (key, text), sentiment in zip(pending.items(), sentiments):
+            _article_cache.put(key, {'sentiment': sentiment, **self.scan_keywords(text)})
     
     def analyze_news_batch(self, news_list: List[Dict]) -> Dict:
         """Analyze a batch of news articles"""
@@ -145,6 +350,9 @@ class NewsAnalyzer:
                 'market_impact': 'Neutral'
             }
         
+        # Score every article missing from the cache in one batch before the per-article pass
+        self._prime_article_cache(news_list)
+        
         analyzed_news = []
         sentiment_counts = {'Positive': 0, 'Negative': 0, 'Neutral': 0}
         category_counts = Counter()
@@ -153,14 +361,11 @@ class NewsAnalyzer:
         
         for news_item in news_list:
             # Analyze individual news item
-            headline = news_item.get('headline', '')
-            summary = news_item.get('summary', '')
-            text = f"{headline} {summary}"
-            
-            sentiment_analysis = self.analyze_sentiment(text)
-            market_impact = self.extract_market_impact_keywords(text)
-            category = self.categorize_news(news_item)
-            mentioned_companies = self.extract_mentioned_companies(text)
+            analysis = self.analyze_article(news_item)
+            sentiment_analysis = analysis['sentiment']
+            market_impact = analysis['market_impact']
+            category = analysis['category']
+            mentioned_companies = analysis['mentioned_companies']
             
             analyzed_item = {
                 'original': news_item,
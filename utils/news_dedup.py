@@ -0,0 +1,109 @@
+"""
+Near-duplicate news detection with MinHash signatures and LSH banding
+"""
+
+import hashlib
+import re
+import numpy as np
+from typing import Dict, List, Set
+
+# Articles whose word-pair sets overlap at least this much (Jaccard) are the same story
+SIMILARITY_THRESHOLD = 0.6
+
+# MinHash signature of LSH_BANDS x LSH_ROWS values; with 8 x 4 a pair at
+# Jaccard 0.6 shares a band ~65% of the time, at 0.8 ~99.9%, at 0.3 ~6%
+LSH_BANDS = 8
+LSH_ROWS = 4
+
+# Mersenne prime for the (a * x + b) mod p hash family; products stay below 2^63
+HASH_PRIME = (1 << 31) - 1
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+URL_PATTERN = re.compile(r"https?://\S+")
+
+# Words too common to tell two stories apart
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'that', 'the', 'to', 'was', 'were', 'will', 'with'
+])
+
+class NewsDeduplicator:
+    """Collapse copies of the same story published under several feeds
+
+    Every article is reduced to the set of word pairs in its headline and
+    summary and given a MinHash signature. Signatures are cut into bands and
+    articles are bucketed by band, so only articles sharing a bucket are
+    compared, and the comparison is an exact Jaccard check of the word-pair
+    sets. Work grows with the number of articles rather than every pair.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD, bands: int = LSH_BANDS, rows: int = LSH_ROWS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+
+        # Fixed seed so the same article always gets the same signature
+        generator = np.random.default_rng(20240101)
+        self.hash_a = generator.integers(1, HASH_PRIME, size=bands * rows, dtype=np.uint64)
+        self.hash_b = generator.integers(0, HASH_PRIME, size=bands * rows, dtype=np.uint64)
+
+    def shingles(self, news_item: Dict) -> Set[str]:
+        """Normalized word pairs of headline and summary; single words for very short texts"""
+        text = f"{news_item.get('headline', '')} {news_item.get('summary', '')}".lower()
+        tokens = [token for token in TOKEN_PATTERN.findall(URL_PATTERN.sub(' ', text)) if token not in STOPWORDS]
+
+        if len(tokens) < 3:
+            return set(tokens)
+        return {f"{first} {second}" for first, second in zip(tokens, tokens[1:])}
+
+    def signature(self, shingles: Set[str]) -> np.ndarray:
+        """MinHash signature: the minimum of every hash function over the shingles"""
+        digests = b''.join(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest() for shingle in sorted(shingles))
+        values = np.frombuffer(digests, dtype='>u4').astype(np.uint64)
+
+        # One row per shingle, one column per hash function
+        hashed = (values[:, None] * self.hash_a + self.hash_b) % HASH_PRIME
+        return hashed.min(axis=0)
+
+    def clusters(self, news_list: List[Dict]) -> List[List[int]]:
+        """Group article positions into near-duplicate clusters, each in input order"""
+        shingle_sets = [self.shingles(news_item) for news_item in news_list]
+        parent = list(range(len(news_list)))
+
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        buckets = {}
+        for index, shingles in enumerate(shingle_sets):
+            if not shingles:
+                # Articles without text carry no evidence of being the same story
+                continue
+
+            bands = self.signature(shingles).reshape(self.bands, self.rows)
+            for band, rows in enumerate(bands):
+                bucket = buckets.setdefault((band, rows.tobytes()), [])
+                for other in bucket:
+                    if find(other) != find(index) and self._jaccard(shingle_sets[other], shingles) >= self.threshold:
+                        parent[find(index)] = find(other)
+                bucket.append(index)
+
+        groups = {}
+        for index in range(len(news_list)):
+            groups.setdefault(find(index), []).append(index)
+        return list(groups.values())
+
+    @staticmethod
+    def _jaccard(first: Set[str], second: Set[str]) -> float:
+        return len(first & second) / len(first | second)
+
+    def collapse(self, news_list: List[Dict]) -> List[Dict]:
+        """Keep the first article of every near-duplicate cluster, preserving input order"""
+        keep = sorted(cluster[0] for cluster in self.clusters(news_list))
+        return [news_list[index] for index in keep]
+
+def collapse_near_duplicates(news_list: List[Dict]) -> List[Dict]:
+    """Drop near-duplicate copies of the same story from a news list"""
+    return NewsDeduplicator().collapse(news_list)
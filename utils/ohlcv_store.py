@@ -0,0 +1,194 @@
+"""
+Persistent on-disk OHLCV store, one Parquet file per symbol and interval
+"""
+
+import os
+import re
+import threading
+import numpy as np
+import pandas as pd
+
+# Yahoo Finance periods expressed as a number of trailing bars
+BAR_COUNT_PERIODS = {
+    '1d': 1,
+    '5d': 5
+}
+
+# Yahoo Finance periods expressed as a calendar offset from today
+CALENDAR_PERIODS = {
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10)
+}
+
+# Periods offered for analysis, shortest first
+PERIOD_ORDER = ['1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y']
+
+# Longest period Yahoo Finance serves for each intraday interval
+# (1m bars go back 7 days, 5m/15m bars 60 days and hourly bars 730 days)
+INTRADAY_MAX_PERIODS = {
+    '1m': '5d',
+    '5m': '1mo',
+    '15m': '1mo',
+    '1h': '1y'
+}
+
+# Daily history is cached at these spans and shorter periods are sliced from them
+DAILY_BASE_PERIODS = ['1y', '5y']
+
+# Relative change in an overlapping adjusted close that means Yahoo re-adjusted the history
+ADJUSTMENT_TOLERANCE = 1e-4
+
+# Weekends and exchange holidays mean the first stored bar can trail the
+# requested start date by a few days while still covering the period
+COVERAGE_TOLERANCE = pd.Timedelta(days=5)
+
+def period_start(period, tz=None):
+    """Get the first timestamp a calendar period covers, or None for bar-count and unbounded periods"""
+    now = pd.Timestamp.now(tz=tz).normalize()
+
+    if period in CALENDAR_PERIODS:
+        return now - CALENDAR_PERIODS[period]
+    if period == 'ytd':
+        return now.replace(month=1, day=1)
+
+    return None
+
+def supported_periods(interval):
+    """Get the analysis periods available for a bar interval"""
+    if interval not in INTRADAY_MAX_PERIODS:
+        return list(PERIOD_ORDER)
+    return PERIOD_ORDER[:PERIOD_ORDER.index(INTRADAY_MAX_PERIODS[interval]) + 1]
+
+def clamp_period(period, interval):
+    """Shorten a period to the longest one available for the interval"""
+    periods = supported_periods(interval)
+    return period if period in periods else periods[-1]
+
+def base_period(period):
+    """Get the cached daily span a period is sliced from"""
+    if period not in PERIOD_ORDER:
+        return period
+
+    for base in DAILY_BASE_PERIODS:
+        if PERIOD_ORDER.index(period) <= PERIOD_ORDER.index(base):
+            return base
+    return period
+
+def slice_period(frame, period):
+    """Trim a history frame down to the bars a Yahoo Finance period would return"""
+    if frame is None or frame.empty:
+        return frame
+
+    if period in BAR_COUNT_PERIODS:
+        # Bar-count periods are trading sessions, which span many bars for intraday data
+        sessions = frame.index.normalize()
+        first_session = sessions.unique()[-BAR_COUNT_PERIODS[period]:][0]
+        return frame[sessions >= first_session]
+
+    start = period_start(period, frame.index.tz)
+    if start is None:
+        return frame
+
+    return frame[frame.index >= start]
+
+class OHLCVStore:
+    def __init__(self, root=None):
+        self.root = root or os.getenv("OHLCV_STORE_DIR", ".cache/ohlcv")
+        self._lock = threading.Lock()
+
+    def _path(self, symbol, interval):
+        """Get the file path for a symbol/interval pair"""
+        safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+        return os.path.join(self.root, f"{safe_symbol}_{interval}.parquet")
+
+    def load(self, symbol, interval="1d"):
+        """Load stored bars, or None when nothing is stored yet"""
+        path = self._path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            frame = pd.read_parquet(path)
+        except Exception:
+            # A corrupt or partially written file is treated as a cache miss
+            return None
+
+        return frame if not frame.empty else None
+
+    def covers(self, frame, period):
+        """Check whether stored bars reach back far enough to serve a period"""
+        if frame is None or frame.empty:
+            return False
+
+        if period in BAR_COUNT_PERIODS:
+            return len(frame) >= BAR_COUNT_PERIODS[period]
+
+        start = period_start(period, frame.index.tz)
+        if start is None:
+            return False
+
+        return frame.index[0] - start <= COVERAGE_TOLERANCE
+
+    def is_consistent(self, stored, tail):
+        """Check whether a downloaded tail is on the same split/dividend adjustment as the stored bars
+
+        Yahoo Finance re-adjusts the whole history after a corporate action,
+        so a split or dividend inside the tail, or a completed overlapping
+        bar whose close moved, means the stored bars are on a stale scale.
+        """
+        if stored is None or tail is None or tail.empty:
+            return True
+
+        for column in ('Stock Splits', 'Dividends'):
+            if column not in tail.columns:
+                continue
+
+            # Actions already stored were applied when the stored bars were downloaded
+            known = stored[column].reindex(tail.index) if column in stored.columns else pd.Series(0.0, index=tail.index)
+            if (tail[column].fillna(0) != known.fillna(0)).any():
+                return False
+
+        # The last stored bar may have been a partial session, only completed bars must match
+        overlap = tail.index.intersection(stored.index[:-1])
+        if overlap.empty:
+            return True
+
+        return bool(np.allclose(
+            tail.loc[overlap, 'Close'].to_numpy(dtype=float),
+            stored.loc[overlap, 'Close'].to_numpy(dtype=float),
+            rtol=ADJUSTMENT_TOLERANCE,
+            equal_nan=True
+        ))
+
+    def merge(self, symbol, interval, new_bars, replace=False):
+        """Merge freshly downloaded bars into the stored ones and persist the result
+
+        Newer downloads win for overlapping timestamps, so a partial bar for
+        the current session is replaced once the session completes. With
+        replace=True the stored bars are discarded in favour of new_bars.
+        """
+        with self._lock:
+            stored = None if replace else self.load(symbol, interval)
+
+            if new_bars is None or new_bars.empty:
+                # Nothing to write, keep serving what is stored
+                return self.load(symbol, interval) if replace else stored
+
+            if stored is not None:
+                merged = pd.concat([stored, new_bars])
+                merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+            else:
+                merged = new_bars.sort_index()
+
+            os.makedirs(self.root, exist_ok=True)
+            path = self._path(symbol, interval)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            merged.to_parquet(temp_path)
+            os.replace(temp_path, path)
+
+            return merged
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, List, Tuple
+
+class PanelIndicatorEngine:
+    """Technical indicators for a whole symbol universe in one vectorized pass
+
+    Every method takes 2-D arrays shaped (time, symbol) and returns arrays of
+    the same shape, NaN until a window is filled. Formulas match the
+    single-series calculations in TechnicalAnalyzer.
+    """
+
+    def _as_panel(self, data) -> np.ndarray:
+        """Convert input to a float (time, symbol) array"""
+        panel = np.asarray(data, dtype=float)
+        return panel.reshape(-1, 1) if panel.ndim == 1 else panel
+
+    def _rolling(self, data: np.ndarray, window: int, reducer) -> np.ndarray:
+        """Apply a reducer over trailing windows; a NaN anywhere in a window yields NaN"""
+        out = np.full(data.shape, np.nan)
+        if len(data) >= window:
+            windows = sliding_window_view(data, window, axis=0)
+            out[window - 1:] = reducer(windows, axis=-1)
+        return out
+
+    def calculate_sma(self, data, window: int) -> np.ndarray:
+        """Calculate Simple Moving Average for every column"""
+        data = self._as_panel(data)
+        out = np.full(data.shape, np.nan)
+        if len(data) < window:
+            return out
+
+        # Running sums give every window mean in O(time x symbols)
+        missing = np.isnan(data)
+        padded_sum = np.vstack([np.zeros((1, data.shape[1])), np.cumsum(np.where(missing, 0.0, data), axis=0)])
+        padded_missing = np.vstack([np.zeros((1, data.shape[1])), np.cumsum(missing, axis=0)])
+
+        window_sum = padded_sum[window:] - padded_sum[:-window]
+        window_missing = padded_missing[window:] - padded_missing[:-window]
+
+        out[window - 1:] = np.where(window_missing == 0, window_sum / window, np.nan)
+        return out
+
+    def calculate_ema(self, data, window: int) -> np.ndarray:
+        """Calculate Exponential Moving Average for every column (span convention, adjusted weights)"""
+        data = self._as_panel(data)
+        decay = 1 - 2 / (window + 1)
+
+        out = np.full(data.shape, np.nan)
+        weighted_sum = np.zeros(data.shape[1])
+        weight_total = np.zeros(data.shape[1])
+
+        # The recursion runs over time only; each step updates all symbols at once
+        for t in range(len(data)):
+            valid = ~np.isnan(data[t])
+            weighted_sum = decay * weighted_sum + np.where(valid, data[t], 0.0)
+            weight_total = decay * weight_total + valid
+            np.divide(weighted_sum, weight_total, out=out[t], where=weight_total > 0)
+
+        return out
+
+    def calculate_rsi(self, data, window: int = 14) -> np.ndarray:
+        """Calculate Relative Strength Index for every column"""
+        data = self._as_panel(data)
+        delta = np.vstack([np.full((1, data.shape[1]), np.nan), np.diff(data, axis=0)])
+
+        with np.errstate(invalid='ignore'):
+            gain = self.calculate_sma(np.where(delta > 0, delta, 0.0), window)
+            loss = self.calculate_sma(np.where(delta < 0, -delta, 0.0), window)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = gain / loss
+            return 100 - (100 / (1 + rs))
+
+    def calculate_macd(self, data, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict:
+        """Calculate MACD (Moving Average Convergence Divergence) for every column"""
+        data = self._as_panel(data)
+        macd = self.calculate_ema(data, fast) - self.calculate_ema(data, slow)
+        macd_signal = self.calculate_ema(macd, signal)
+
+        return {
+            'macd': macd,
+            'signal': macd_signal,
+            'histogram': macd - macd_signal
+        }
+
+    def calculate_bollinger_bands(self, data, window: int = 20, num_std: float = 2) -> Dict:
+        """Calculate Bollinger Bands for every column"""
+        data = self._as_panel(data)
+        sma = self.calculate_sma(data, window)
+        std = self._rolling(data, window, lambda windows, axis: windows.std(axis=axis, ddof=1))
+
+        return {
+            'upper': sma + (std * num_std),
+            'middle': sma,
+            'lower': sma - (std * num_std)
+        }
+
+    def calculate_stochastic(self, high, low, close, k_window: int = 14, d_window: int = 3) -> Dict:
+        """Calculate Stochastic Oscillator for every column"""
+        high = self._as_panel(high)
+        low = self._as_panel(low)
+        close = self._as_panel(close)
+
+        lowest_low = self._rolling(low, k_window, np.min)
+        highest_high = self._rolling(high, k_window, np.max)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+
+        return {
+            'k': k_percent,
+            'd': self.calculate_sma(k_percent, d_window)
+        }
+
+    def compute_all(self, close, high=None, low=None) -> Dict:
+        """Compute the standard indicator set for every column in one pass
+
+        Stochastic values are only included when high and low are given.
+        """
+        close = self._as_panel(close)
+
+        macd = self.calculate_macd(close)
+        bollinger = self.calculate_bollinger_bands(close)
+
+        indicators = {
+            'sma_20': self.calculate_sma(close, 20),
+            'sma_50': self.calculate_sma(close, 50),
+            'ema_12': self.calculate_ema(close, 12),
+            'rsi': self.calculate_rsi(close),
+            'macd': macd['macd'],
+            'macd_signal': macd['signal'],
+            'macd_histogram': macd['histogram'],
+            'bb_upper': bollinger['upper'],
+            'bb_middle': bollinger['middle'],
+            'bb_lower': bollinger['lower']
+        }
+
+        if high is not None and low is not None:
+            stochastic = self.calculate_stochastic(high, low, close)
+            indicators['stoch_k'] = stochastic['k']
+            indicators['stoch_d'] = stochastic['d']
+
+        return indicators
+
+    def panel_arrays(self, panel: pd.DataFrame, field: str = 'Close') -> Tuple[np.ndarray, List[str], pd.Index]:
+        """Extract one field of a bulk history panel as a (time, symbol) array
+
+        Returns the array together with its column symbols and row timestamps.
+        """
+        frame = panel[field]
+        return frame.to_numpy(dtype=float), list(frame.columns), frame.index
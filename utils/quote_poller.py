@@ -0,0 +1,105 @@
+"""
+Background poller that keeps a shared last-price table for watched symbols
+"""
+
+import threading
+import time
+
+# Seconds between polls of the upstream provider
+POLL_INTERVAL = 15
+
+# Symbols nobody has asked for in this many seconds stop being polled
+WATCH_TIMEOUT = 300
+
+class QuotePoller:
+    """Refresh the latest quote of every watched symbol with one batched request per cycle
+
+    Readers never call upstream themselves: get() is a dict lookup into the
+    table the poller thread maintains, so any number of sessions reading the
+    same symbols cost one request per cycle in total.
+    """
+
+    def __init__(self, fetch_batch, interval=POLL_INTERVAL, watch_timeout=WATCH_TIMEOUT):
+        self.fetch_batch = fetch_batch
+        self.interval = interval
+        self.watch_timeout = watch_timeout
+        self.quotes = {}
+        self.watched = {}
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._updated = threading.Condition(self._lock)
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def _ensure_running(self):
+        """Start the polling thread on first use"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="quote-poller", daemon=True)
+            self._thread.start()
+
+    def watch(self, symbols):
+        """Mark symbols as wanted; unseen symbols trigger an immediate poll"""
+        now = time.monotonic()
+        with self._lock:
+            new_symbols = [symbol for symbol in symbols if symbol not in self.watched]
+            for symbol in symbols:
+                self.watched[symbol] = now
+            self._ensure_running()
+
+        if new_symbols:
+            self._wakeup.set()
+
+    def get(self, symbol, wait=5.0):
+        """Get the latest quote for a symbol, waiting up to wait seconds for its first poll"""
+        return self.get_many([symbol], wait).get(symbol)
+
+    def get_many(self, symbols, wait=5.0):
+        """Get the latest quotes for several symbols; symbols without a quote are left out"""
+        self.watch(symbols)
+        deadline = time.monotonic() + wait
+
+        with self._updated:
+            # Only the very first read of a symbol waits, later reads are plain lookups
+            while any(symbol not in self.quotes for symbol in symbols):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._updated.wait(remaining)
+
+            return {symbol: self.quotes[symbol] for symbol in symbols if self.quotes.get(symbol)}
+
+    def _active_symbols(self):
+        """Get the watched symbols and forget the ones nobody asked for recently"""
+        cutoff = time.monotonic() - self.watch_timeout
+        with self._lock:
+            for symbol in [symbol for symbol, seen in self.watched.items() if seen < cutoff]:
+                del self.watched[symbol]
+            return list(self.watched)
+
+    def poll_once(self):
+        """Refresh the table for every active symbol with a single batched fetch"""
+        symbols = self._active_symbols()
+        if not symbols:
+            return
+
+        try:
+            quotes = self.fetch_batch(symbols)
+            self.last_error = None
+        except Exception as e:
+            # Keep serving the previous quotes; the next cycle retries
+            self.last_error = e
+            quotes = {}
+
+        with self._updated:
+            self.quotes.update(quotes)
+            for symbol in symbols:
+                if symbol not in quotes and symbol not in self.quotes:
+                    # Record the miss so first readers stop waiting for it
+                    self.quotes[symbol] = None
+            self._updated.notify_all()
+
+    def _run(self):
+        while True:
+            self.poll_once()
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
@@ -0,0 +1,198 @@
+"""
+Process-wide rate limiting, retries and circuit breaking for upstream data providers
+"""
+
+import random
+import threading
+import time
+import requests
+
+# Sustained requests per second and burst size per provider
+PROVIDER_LIMITS = {
+    'finnhub': {'rate': 0.75, 'capacity': 15},  # Free tier allows 60 calls per minute: 15 burst + 45 refilled
+    'yahoo': {'rate': 2.0, 'capacity': 10}
+}
+
+class CircuitOpenError(Exception):
+    """Raised when a provider's circuit is open and no stale data is available"""
+
+class IncompleteDataError(Exception):
+    """Raised when a provider answered without part of the requested data, treated as a transient failure"""
+    status_code = 503
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Block until tokens are available and take them
+
+        A request larger than the bucket waits for a full bucket and leaves
+        it in debt, so later callers wait until the excess is paid back.
+        """
+        needed = min(tokens, self.capacity)
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+
+                if self.tokens >= needed:
+                    self.tokens -= tokens
+                    return
+
+                wait = (needed - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        with self._lock:
+            return self.opened_at is not None and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def allow(self):
+        """Check whether a call may go upstream"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Half-open: let calls through again, a single failure re-opens the circuit
+                self.opened_at = None
+                self.failures = self.failure_threshold - 1
+                return True
+
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+def _status_code(exc):
+    """Get the HTTP status code carried by a provider exception, if any"""
+    status = getattr(exc, 'status_code', None)
+    if status is None and getattr(exc, 'response', None) is not None:
+        status = getattr(exc.response, 'status_code', None)
+    return status
+
+def is_rate_limited(exc):
+    """Check whether an exception means the provider throttled us"""
+    return _status_code(exc) == 429 or 'RateLimit' in type(exc).__name__
+
+def is_retryable(exc):
+    """Check whether an exception is a transient upstream failure worth retrying"""
+    if is_rate_limited(exc):
+        return True
+
+    if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout, TimeoutError)):
+        return True
+
+    status = _status_code(exc)
+    return status is not None and status >= 500
+
+def _retry_after(exc):
+    """Get the server-requested delay in seconds from a 429 response, if any"""
+    response = getattr(exc, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+class ProviderGuard:
+    def __init__(self, name, rate, capacity, max_retries=3, base_delay=0.5, max_delay=8.0,
+                 failure_threshold=5, reset_timeout=60):
+        self.name = name
+        self.bucket = TokenBucket(rate, capacity)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._stale = {}
+        self._stale_lock = threading.Lock()
+
+    def _backoff(self, attempt, exc):
+        """Full-jitter exponential backoff, never shorter than a server-requested delay"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+        retry_after = _retry_after(exc)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+
+        return delay
+
+    def _serve_stale(self, stale_key, exc):
+        """Return the last good result for a call, or re-raise when there is none"""
+        if stale_key is not None:
+            with self._stale_lock:
+                if stale_key in self._stale:
+                    return self._stale[stale_key]
+        raise exc
+
+    def call(self, fetch, *args, stale_key=None, stale_if=None, cost=1, **kwargs):
+        """Call fetch(*args, **kwargs) under the provider's rate limit
+
+        Transient failures are retried with backoff. When retries run out or
+        the circuit is open, the last good result stored under stale_key is
+        returned instead of failing. stale_if can reject results that should
+        not be served later as the last good one. cost is the number of
+        upstream requests one attempt makes, or a callable evaluated before
+        every attempt when retries make fewer requests.
+        """
+        if not self.breaker.allow():
+            return self._serve_stale(stale_key, CircuitOpenError(f"{self.name} is temporarily unavailable"))
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire(cost() if callable(cost) else cost)
+
+            try:
+                result = fetch(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+
+                if attempt == self.max_retries:
+                    self.breaker.record_failure()
+                    return self._serve_stale(stale_key, e)
+
+                time.sleep(self._backoff(attempt, e))
+                continue
+
+            self.breaker.record_success()
+            if stale_key is not None and (stale_if is None or stale_if(result)):
+                with self._stale_lock:
+                    self._stale[stale_key] = result
+
+            return result
+
+_guards = {}
+_guards_lock = threading.Lock()
+
+def get_provider_guard(provider):
+    """Get the process-wide guard shared by every caller of a provider"""
+    with _guards_lock:
+        if provider not in _guards:
+            limits = PROVIDER_LIMITS.get(provider, {'rate': 1.0, 'capacity': 5})
+            _guards[provider] = ProviderGuard(provider, **limits)
+        return _guards[provider]
@@ -0,0 +1,104 @@
+"""
+Top-N screens over a columnar snapshot of the stock universe
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+from utils.panel_indicators import PanelIndicatorEngine
+
+# Sessions the latest volume is compared against for volume spikes
+VOLUME_BASELINE_WINDOW = 20
+
+def build_snapshot(panel: pd.DataFrame, summary: pd.DataFrame, names: Dict[str, str]) -> Dict[str, np.ndarray]:
+    """Build one array per metric, aligned on the symbols of a latest-bar summary
+
+    summary is the per-symbol frame from DataFetcher._summarize_latest
+    (price, prev_close, open, volume, change, change_percent).
+    """
+    symbols = list(summary.index)
+    close = panel['Close'].reindex(columns=symbols)
+    volume = panel['Volume'].reindex(columns=symbols).to_numpy(dtype=float)
+
+    # RSI on forward-filled closes so a symbol that skipped the last session still has a value
+    rsi = PanelIndicatorEngine().calculate_rsi(close.ffill().to_numpy(dtype=float))[-1]
+
+    # Average volume of the sessions before the latest one
+    baseline = np.full(len(symbols), np.nan)
+    if len(volume) > 1:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            baseline = np.nanmean(volume[-VOLUME_BASELINE_WINDOW - 1:-1], axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_spike = summary['volume'].to_numpy(dtype=float) / baseline
+        gap_percent = (summary['open'] - summary['prev_close']).to_numpy(dtype=float) / summary['prev_close'].to_numpy(dtype=float) * 100
+
+    return {
+        'symbol': np.array(symbols, dtype=object),
+        'name': np.array([names.get(symbol, symbol) for symbol in symbols], dtype=object),
+        'price': summary['price'].to_numpy(dtype=float),
+        'change': summary['change'].to_numpy(dtype=float),
+        'change_percent': summary['change_percent'].to_numpy(dtype=float),
+        'volume': summary['volume'].to_numpy(dtype=float),
+        'traded_value': (summary['price'] * summary['volume']).to_numpy(dtype=float),
+        'volume_spike': np.where(np.isfinite(volume_spike), volume_spike, np.nan),
+        'rsi': rsi,
+        'gap_percent': gap_percent
+    }
+
+class UniverseScreener:
+    """Rank the stock universe by a metric without sorting every symbol
+
+    Metrics: change_percent, volume, traded_value, volume_spike, rsi and
+    gap_percent. Only the n selected rows are sorted; the rest of the
+    universe is handled with a single argpartition.
+    """
+
+    def __init__(self, snapshot: Dict[str, np.ndarray]):
+        self.snapshot = snapshot
+
+    def _mask(self, filters: Dict[str, Tuple]) -> np.ndarray:
+        """Combine (min, max) range filters into one boolean mask; None leaves a side open"""
+        mask = np.ones(len(self.snapshot['symbol']), dtype=bool)
+
+        for metric, (low, high) in (filters or {}).items():
+            values = self.snapshot[metric]
+            with np.errstate(invalid='ignore'):
+                if low is not None:
+                    mask &= values >= low
+                if high is not None:
+                    mask &= values <= high
+
+        return mask
+
+    def screen(self, metric: str, n: int = 5, filters: Dict[str, Tuple] = None, ascending: bool = False) -> List[Dict]:
+        """Get the top n symbols by a metric (bottom n with ascending=True) as row dicts"""
+        if metric not in self.snapshot:
+            raise ValueError(f"Unknown screen metric: {metric}")
+
+        values = self.snapshot[metric]
+        candidates = np.flatnonzero(self._mask(filters) & ~np.isnan(values))
+        if n <= 0 or len(candidates) == 0:
+            return []
+
+        # Rank keys where smaller is better, so one partition serves both directions
+        keys = values[candidates] if ascending else -values[candidates]
+        k = min(n, len(candidates))
+        top = np.argpartition(keys, k - 1)[:k]
+        selected = candidates[top[np.argsort(keys[top], kind='stable')]]
+
+        return [{column: self._scalar(data[i]) for column, data in self.snapshot.items()} for i in selected]
+
+    @staticmethod
+    def _scalar(value):
+        """Convert NumPy scalars to plain Python values for display code"""
+        return value.item() if isinstance(value, np.generic) else value
+
+    def top_gainers_losers(self, n: int = 5) -> Tuple[List[Dict], List[Dict]]:
+        """Get the n best advancing and n worst declining stocks"""
+        # Gainers must be strictly positive, unchanged stocks count as losers
+        gainers = self.screen('change_percent', n, {'change_percent': (np.nextafter(0, 1), None)})
+        losers = self.screen('change_percent', n, {'change_percent': (None, 0)}, ascending=True)
+        return gainers, losers
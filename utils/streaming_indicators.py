@@ -0,0 +1,208 @@
+"""
+Incremental indicators that update in O(1) per new bar
+"""
+
+import math
+from collections import deque
+from typing import Dict, Iterable
+
+class RollingSMA:
+    """Simple Moving Average over a fixed trailing window"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+
+    def update(self, value: float) -> float:
+        self.values.append(value)
+        self.total += value
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.total / self.window if len(self.values) == self.window else math.nan
+
+class RollingStd:
+    """Sample standard deviation over a fixed trailing window (windowed Welford)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, value: float) -> float:
+        self.values.append(value)
+        count = len(self.values)
+        delta = value - self.mean
+        self.mean += delta / count
+        self.m2 += delta * (value - self.mean)
+
+        if count > self.window:
+            # Remove the oldest value from the running moments
+            oldest = self.values.popleft()
+            count -= 1
+            delta = oldest - self.mean
+            self.mean -= delta / count
+            self.m2 -= delta * (oldest - self.mean)
+
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if len(self.values) < self.window or self.window < 2:
+            return math.nan
+        return math.sqrt(max(self.m2, 0.0) / (self.window - 1))
+
+class StreamingEMA:
+    """Exponential Moving Average with the same adjusted weights as pandas ewm(span=window)"""
+
+    def __init__(self, window: int):
+        self.decay = 1 - 2 / (window + 1)
+        self.weighted_sum = 0.0
+        self.weight_total = 0.0
+
+    def update(self, value: float) -> float:
+        self.weighted_sum = self.decay * self.weighted_sum + value
+        self.weight_total = self.decay * self.weight_total + 1
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.weighted_sum / self.weight_total if self.weight_total else math.nan
+
+class WilderRSI:
+    """Relative Strength Index with Wilder's smoothing"""
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.previous = None
+        self.seed_gains = []
+        self.seed_losses = []
+        self.avg_gain = None
+        self.avg_loss = None
+
+    def update(self, value: float) -> float:
+        if self.previous is None:
+            self.previous = value
+            return math.nan
+
+        change = value - self.previous
+        self.previous = value
+        gain = max(change, 0.0)
+        loss = max(-change, 0.0)
+
+        if self.avg_gain is None:
+            # The first average is a plain mean over the initial window
+            self.seed_gains.append(gain)
+            self.seed_losses.append(loss)
+            if len(self.seed_gains) == self.window:
+                self.avg_gain = sum(self.seed_gains) / self.window
+                self.avg_loss = sum(self.seed_losses) / self.window
+            return self.value
+
+        self.avg_gain = (self.avg_gain * (self.window - 1) + gain) / self.window
+        self.avg_loss = (self.avg_loss * (self.window - 1) + loss) / self.window
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.avg_gain is None:
+            return math.nan
+        if self.avg_loss == 0:
+            return 100.0 if self.avg_gain > 0 else 50.0
+        return 100 - (100 / (1 + self.avg_gain / self.avg_loss))
+
+class StreamingMACD:
+    """MACD line, signal line and histogram from incremental EMAs"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+
+    def update(self, value: float) -> Dict:
+        macd = self.fast.update(value) - self.slow.update(value)
+        self.signal.update(macd)
+        return self.value
+
+    @property
+    def value(self) -> Dict:
+        if not self.signal.weight_total:
+            return {'macd': math.nan, 'signal': math.nan, 'histogram': math.nan}
+
+        macd = self.fast.value - self.slow.value
+        return {
+            'macd': macd,
+            'signal': self.signal.value,
+            'histogram': macd - self.signal.value
+        }
+
+class LiveIndicatorState:
+    """Bundle of incremental indicators for one symbol's live bar stream"""
+
+    def __init__(self, sma_window: int = 20, rsi_window: int = 14, bollinger_window: int = 20, num_std: float = 2):
+        self.sma = RollingSMA(sma_window)
+        self.ema = StreamingEMA(12)
+        self.rsi = WilderRSI(rsi_window)
+        self.macd = StreamingMACD()
+        self.bollinger_mid = RollingSMA(bollinger_window)
+        self.bollinger_std = RollingStd(bollinger_window)
+        self.num_std = num_std
+        self.last_timestamp = None
+        self.last_close = math.nan
+        self.bars_seen = 0
+
+    def update(self, timestamp, close: float):
+        """Feed one completed bar; bars at or before the last seen timestamp are ignored"""
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return
+
+        self.sma.update(close)
+        self.ema.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.bollinger_mid.update(close)
+        self.bollinger_std.update(close)
+
+        self.last_timestamp = timestamp
+        self.last_close = close
+        self.bars_seen += 1
+
+    def sync(self, closes: Iterable):
+        """Feed every bar of a (timestamp, close) series that is newer than the state"""
+        if hasattr(closes, 'items'):
+            if self.last_timestamp is not None:
+                # Only bars after the last update are walked, earlier ones are cut off in one step
+                closes = closes[closes.index > self.last_timestamp]
+            items = closes.items()
+        else:
+            items = closes
+
+        for timestamp, close in items:
+            if close == close:  # Skip NaN bars
+                self.update(timestamp, float(close))
+
+    def snapshot(self) -> Dict:
+        """Get the current indicator values"""
+        middle = self.bollinger_mid.value
+        std = self.bollinger_std.value
+        macd = self.macd.value
+
+        return {
+            'timestamp': self.last_timestamp,
+            'close': self.last_close,
+            'bars': self.bars_seen,
+            'sma_20': self.sma.value,
+            'ema_12': self.ema.value,
+            'rsi': self.rsi.value,
+            'macd': macd['macd'],
+            'macd_signal': macd['signal'],
+            'macd_histogram': macd['histogram'],
+            'bb_upper': middle + self.num_std * std,
+            'bb_middle': middle,
+            'bb_lower': middle - self.num_std * std
+        }
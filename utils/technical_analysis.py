@@ -5,6 +5,22 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import streamlit as st
 from typing import Dict, List, Tuple
+from utils.chart_utils import (PIXELS_PER_CANDLE, aggregate_ohlc, candle_colors, decimate_bars, decimate_line,
+                               line_trace, minmax_indices, up_down_colors)
+
+# Indicator windows shared by the summary, the signals and the charts
+DEFAULT_INDICATOR_PARAMS = {
+    'sma_short': 20,
+    'sma_long': 50,
+    'ema': 12,
+    'rsi': 14,
+    'macd_fast': 12,
+    'macd_slow': 26,
+    'macd_signal': 9,
+    'bb_window': 20,
+    'bb_std': 2,
+    'volume_sma': 20
+}
 
 class TechnicalAnalyzer:
     def __init__(self):
@@ -85,25 +101,65 @@ class TechnicalAnalyzer:
             'support': support_levels.tail(5).tolist()
         }
     
-    def generate_signals(self, stock_data: pd.DataFrame) -> Dict:
+    def compute_indicators(self, stock_data: pd.DataFrame, params: Dict = None) -> pd.DataFrame:
+        """Calculate every indicator used by the summary, signals and charts
+
+        Returns a frame aligned with stock_data's index.
+        """
+        params = {**DEFAULT_INDICATOR_PARAMS, **(params or {})}
+        close = stock_data['Close']
+        
+        indicators = pd.DataFrame(index=stock_data.index)
+        indicators['SMA_20'] = self.calculate_sma(close, params['sma_short'])
+        indicators['SMA_50'] = self.calculate_sma(close, params['sma_long'])
+        indicators['EMA_12'] = self.calculate_ema(close, params['ema'])
+        
+        bollinger = self.calculate_bollinger_bands(close, params['bb_window'], params['bb_std'])
+        indicators['BB_Upper'] = bollinger['upper']
+        indicators['BB_Lower'] = bollinger['lower']
+        indicators['BB_Middle'] = bollinger['middle']
+        
+        indicators['RSI'] = self.calculate_rsi(close, params['rsi'])
+        macd_data = self.calculate_macd(close, params['macd_fast'], params['macd_slow'], params['macd_signal'])
+        indicators['MACD'] = macd_data['macd']
+        indicators['MACD_Signal'] = macd_data['signal']
+        indicators['MACD_Histogram'] = macd_data['histogram']
+        
+        indicators['Volume_SMA'] = self.calculate_volume_sma(stock_data['Volume'], params['volume_sma'])
+        
+        return indicators
+    
+    def get_indicator_bundle(self, stock_data: pd.DataFrame, symbol: str = None, period: str = None, params: Dict = None,
+                             interval: str = "1d") -> pd.DataFrame:
+        """Get the indicator frame for a price history, computed once per data version
+
+        Bundles are cached by (symbol, period, interval, last bar, params), so every
+        consumer on a rerun reads the same computation. Without a symbol the
+        indicators are computed directly.
+        """
+        if symbol is None or stock_data.empty:
+            return self.compute_indicators(stock_data, params)
+        
+        params = tuple(sorted({**DEFAULT_INDICATOR_PARAMS, **(params or {})}.items()))
+        # The last close is part of the version so an updating intraday bar is not served stale
+        data_version = (len(stock_data), stock_data.index[-1], float(stock_data['Close'].iloc[-1]))
+        
+        return _cached_indicator_bundle(symbol, period, interval, data_version, params, stock_data)
+    
+    def generate_signals(self, stock_data: pd.DataFrame, indicators: pd.DataFrame = None) -> Dict:
         """Generate buy/sell signals based on technical indicators"""
         signals = {}
         
-        # Calculate indicators
-        stock_data['SMA_20'] = self.calculate_sma(stock_data['Close'], 20)
-        stock_data['SMA_50'] = self.calculate_sma(stock_data['Close'], 50)
-        stock_data['RSI'] = self.calculate_rsi(stock_data['Close'])
-        
-        macd_data = self.calculate_macd(stock_data['Close'])
-        stock_data['MACD'] = macd_data['macd']
-        stock_data['MACD_Signal'] = macd_data['signal']
+        # Calculate indicators unless a precomputed bundle was passed in
+        if indicators is None:
+            indicators = self.compute_indicators(stock_data)
         
         # Moving Average Crossover Signal
-        ma_signal = np.where(stock_data['SMA_20'] > stock_data['SMA_50'], 1, -1)
+        ma_signal = np.where(indicators['SMA_20'] > indicators['SMA_50'], 1, -1)
         signals['ma_crossover'] = ma_signal[-1] if len(ma_signal) > 0 else 0
         
         # RSI Signal
-        current_rsi = stock_data['RSI'].iloc[-1] if not stock_data['RSI'].empty else 50
+        current_rsi = indicators['RSI'].iloc[-1] if not indicators['RSI'].empty else 50
         if current_rsi > 70:
             signals['rsi'] = -1  # Overbought - Sell signal
         elif current_rsi < 30:
@@ -113,10 +169,10 @@ class TechnicalAnalyzer:
         
         # MACD Signal
         if len(stock_data) >= 2:
-            current_macd = stock_data['MACD'].iloc[-1]
-            current_signal = stock_data['MACD_Signal'].iloc[-1]
-            prev_macd = stock_data['MACD'].iloc[-2]
-            prev_signal = stock_data['MACD_Signal'].iloc[-2]
+            current_macd = indicators['MACD'].iloc[-1]
+            current_signal = indicators['MACD_Signal'].iloc[-1]
+            prev_macd = indicators['MACD'].iloc[-2]
+            prev_signal = indicators['MACD_Signal'].iloc[-2]
             
             if prev_macd <= prev_signal and current_macd > current_signal:
                 signals['macd'] = 1  # Bullish crossover
@@ -129,24 +185,30 @@ class TechnicalAnalyzer:
         
         return signals
     
-    def create_technical_chart(self, stock_data: pd.DataFrame, symbol: str) -> go.Figure:
-        """Create comprehensive technical analysis chart"""
-        # Calculate technical indicators
-        stock_data = stock_data.copy()
-        stock_data['SMA_20'] = self.calculate_sma(stock_data['Close'], 20)
-        stock_data['SMA_50'] = self.calculate_sma(stock_data['Close'], 50)
-        stock_data['EMA_12'] = self.calculate_ema(stock_data['Close'], 12)
-        
-        bollinger = self.calculate_bollinger_bands(stock_data['Close'])
-        stock_data['BB_Upper'] = bollinger['upper']
-        stock_data['BB_Lower'] = bollinger['lower']
-        stock_data['BB_Middle'] = bollinger['middle']
-        
-        stock_data['RSI'] = self.calculate_rsi(stock_data['Close'])
-        macd_data = self.calculate_macd(stock_data['Close'])
-        stock_data['MACD'] = macd_data['macd']
-        stock_data['MACD_Signal'] = macd_data['signal']
-        stock_data['MACD_Histogram'] = macd_data['histogram']
+    def create_technical_chart(self, stock_data: pd.DataFrame, symbol: str, indicators: pd.DataFrame = None,
+                               max_points: int = None, template: str = 'plotly_white') -> go.Figure:
+        """Create comprehensive technical analysis chart
+
+        With max_points set, long histories are downsampled before plotting:
+        candles are merged into wider OHLC bars, lines keep their shape via
+        LTTB and bar traces keep each bucket's extremes.
+        """
+        # Attach technical indicators, computing them only if no bundle was passed in
+        if indicators is None:
+            indicators = self.compute_indicators(stock_data)
+        stock_data = stock_data.drop(columns=indicators.columns, errors='ignore').join(indicators)
+        
+        # Indicators are computed on full history first, then only the plotted points are thinned
+        candles = aggregate_ohlc(stock_data, max_points // PIXELS_PER_CANDLE if max_points else None)
+        sma_20 = decimate_line(stock_data['SMA_20'], max_points)
+        sma_50 = decimate_line(stock_data['SMA_50'], max_points)
+        bb_upper = decimate_line(stock_data['BB_Upper'], max_points)
+        bb_lower = decimate_line(stock_data['BB_Lower'], max_points)
+        rsi = decimate_line(stock_data['RSI'], max_points)
+        macd = decimate_line(stock_data['MACD'], max_points)
+        macd_signal = decimate_line(stock_data['MACD_Signal'], max_points)
+        macd_histogram = decimate_bars(stock_data['MACD_Histogram'], max_points)
+        volume_data = stock_data.iloc[minmax_indices(stock_data['Volume'].to_numpy(dtype=float), max_points)]
         
         # Create subplots
         fig = make_subplots(
@@ -160,11 +222,11 @@ class TechnicalAnalyzer:
         # Candlestick chart
         fig.add_trace(
             go.Candlestick(
-                x=stock_data.index,
-                open=stock_data['Open'],
-                high=stock_data['High'],
-                low=stock_data['Low'],
-                close=stock_data['Close'],
+                x=candles.index,
+                open=candles['Open'],
+                high=candles['High'],
+                low=candles['Low'],
+                close=candles['Close'],
                 name='Price',
                 increasing_line_color='#00ff00',
                 decreasing_line_color='#ff0000'
@@ -174,9 +236,9 @@ class TechnicalAnalyzer:
         
         # Moving Averages
         fig.add_trace(
-            go.Scatter(
-                x=stock_data.index,
-                y=stock_data['SMA_20'],
+            line_trace(
+                x=sma_20.index,
+                y=sma_20,
                 mode='lines',
                 name='SMA 20',
                 line=dict(color='orange', width=1)
@@ -185,9 +247,9 @@ class TechnicalAnalyzer:
         )
         
         fig.add_trace(
-            go.Scatter(
-                x=stock_data.index,
-                y=stock_data['SMA_50'],
+            line_trace(
+                x=sma_50.index,
+                y=sma_50,
                 mode='lines',
                 name='SMA 50',
                 line=dict(color='blue', width=1)
@@ -197,9 +259,9 @@ class TechnicalAnalyzer:
         
         # Bollinger Bands
         fig.add_trace(
-            go.Scatter(
-                x=stock_data.index,
-                y=stock_data['BB_Upper'],
+            line_trace(
+                x=bb_upper.index,
+                y=bb_upper,
                 mode='lines',
                 name='BB Upper',
                 line=dict(color='gray', width=1, dash='dash'),
@@ -209,9 +271,9 @@ class TechnicalAnalyzer:
         )
         
         fig.add_trace(
-            go.Scatter(
-                x=stock_data.index,
-                y=stock_data['BB_Lower'],
+            line_trace(
+                x=bb_lower.index,
+                y=bb_lower,
                 mode='lines',
                 name='BB Lower',
                 line=dict(color='gray', width=1, dash='dash'),
@@ -224,9 +286,9 @@ class TechnicalAnalyzer:
         
         # RSI
         fig.add_trace(
-            go.Scatter(
-                x=stock_data.index,
-                y=stock_data['RSI'],
+            line_trace(
+                x=rsi.index,
+                y=rsi,
                 mode='lines',
                 name='RSI',
                 line=dict(color='purple', width=2)
@@ -241,9 +303,9 @@ class TechnicalAnalyzer:
         
         # MACD
         fig.add_trace(
-            go.Scatter(
-                x=stock_data.index,
-                y=stock_data['MACD'],
+            line_trace(
+                x=macd.index,
+                y=macd,
                 mode='lines',
                 name='MACD',
                 line=dict(color='blue', width=2)
@@ -252,9 +314,9 @@ class TechnicalAnalyzer:
         )
         
         fig.add_trace(
-            go.Scatter(
-                x=stock_data.index,
-                y=stock_data['MACD_Signal'],
+            line_trace(
+                x=macd_signal.index,
+                y=macd_signal,
                 mode='lines',
                 name='Signal',
                 line=dict(color='red', width=2)
@@ -263,11 +325,11 @@ class TechnicalAnalyzer:
         )
         
         # MACD Histogram
-        colors = ['green' if x >= 0 else 'red' for x in stock_data['MACD_Histogram']]
+        colors = up_down_colors(macd_histogram)
         fig.add_trace(
             go.Bar(
-                x=stock_data.index,
-                y=stock_data['MACD_Histogram'],
+                x=macd_histogram.index,
+                y=macd_histogram,
                 name='MACD Histogram',
                 marker_color=colors,
                 opacity=0.7
@@ -276,13 +338,12 @@ class TechnicalAnalyzer:
         )
         
         # Volume
-        volume_colors = ['green' if stock_data['Close'].iloc[i] >= stock_data['Open'].iloc[i] 
-                        else 'red' for i in range(len(stock_data))]
+        volume_colors = candle_colors(volume_data)
         
         fig.add_trace(
             go.Bar(
-                x=stock_data.index,
-                y=stock_data['Volume'],
+                x=volume_data.index,
+                y=volume_data['Volume'],
                 name='Volume',
                 marker_color=volume_colors,
                 opacity=0.7
@@ -296,7 +357,7 @@ class TechnicalAnalyzer:
             xaxis_title='Date',
             height=800,
             showlegend=True,
-            template='plotly_white'
+            template=template
         )
         
         # Update y-axes
@@ -307,15 +368,17 @@ class TechnicalAnalyzer:
         
         return fig
     
-    def get_technical_summary(self, stock_data: pd.DataFrame) -> Dict:
+    def get_technical_summary(self, stock_data: pd.DataFrame, indicators: pd.DataFrame = None) -> Dict:
         """Generate technical analysis summary"""
-        signals = self.generate_signals(stock_data)
+        if indicators is None:
+            indicators = self.compute_indicators(stock_data)
         
-        # Calculate current indicator values
-        current_rsi = self.calculate_rsi(stock_data['Close']).iloc[-1] if len(stock_data) > 14 else 50
-        macd_data = self.calculate_macd(stock_data['Close'])
-        current_macd = macd_data['macd'].iloc[-1] if len(macd_data['macd']) > 0 else 0
-        current_signal = macd_data['signal'].iloc[-1] if len(macd_data['signal']) > 0 else 0
+        signals = self.generate_signals(stock_data, indicators)
+        
+        # Read current indicator values
+        current_rsi = indicators['RSI'].iloc[-1] if len(stock_data) > 14 else 50
+        current_macd = indicators['MACD'].iloc[-1] if len(indicators['MACD']) > 0 else 0
+        current_signal = indicators['MACD_Signal'].iloc[-1] if len(indicators['MACD_Signal']) > 0 else 0
         
         # Support and resistance
         support_resistance = self.identify_support_resistance(stock_data['Close'])
@@ -342,3 +405,8 @@ class TechnicalAnalyzer:
             'resistance_levels': support_resistance['resistance'],
             'individual_signals': signals
         }
+
+@st.cache_data(ttl=3600, max_entries=256)
+def _cached_indicator_bundle(symbol, period, interval, data_version, params, _stock_data):
+    """Compute an indicator bundle once per (symbol, period, interval, data version, params)"""
+    return TechnicalAnalyzer().compute_indicators(_stock_data, dict(params))